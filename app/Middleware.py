@@ -1,12 +1,17 @@
 # app/middleware.py
+import logging
 from datetime import date
+from django.contrib.auth import get_user_model
 from django.http import JsonResponse
-from django.urls import resolve
 from django.utils.deprecation import MiddlewareMixin
-from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from jwt import decode as jwt_decode
-from django.conf import settings
+
+from .backends import get_token_user
+from .models import Shop
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
 
 class SubscriptionMiddleware(MiddlewareMixin):
     """
@@ -26,59 +31,39 @@ class SubscriptionMiddleware(MiddlewareMixin):
         "/api/payment-verification-status/", 
     ]
 
+    # Public API paths, checked with a single str.startswith(tuple) call
+    _PUBLIC_PREFIXES = tuple(PUBLIC_PATHS)
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         path = request.path
-        print(f"\n🔍 SubscriptionMiddleware checking path: {path}")
 
-        # Allow admin panel access (both old and new URLs)
-        if path.startswith("/admin/") or path.startswith("/admin-mnlz/"):
+        # Only API endpoints are subscription-gated (admin, static, media,
+        # favicon etc. live outside /api/)
+        if not path.startswith("/api/"):
             return self.get_response(request)
 
-        if path.startswith("/static/") or path.startswith("/media/"):
-            return self.get_response(request)
+        logger.debug("SubscriptionMiddleware checking path: %s", path)
 
-        for public_path in self.PUBLIC_PATHS:
-            if path.startswith(public_path):
-                print(f"✓ Allowing public path: {path}")
-                return self.get_response(request)
+        if path.startswith(self._PUBLIC_PREFIXES):
+            logger.debug("Allowing public path: %s", path)
+            return self.get_response(request)
 
         if request.method == "OPTIONS":
             return self.get_response(request)
 
         user = self.get_user_from_request(request)
-        
-        if not user or not user.is_authenticated:
-            user = request.user
-        
-        if not user or not user.is_authenticated:
-            auth_header = request.headers.get('Authorization', '')
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                try:
-                    decoded_data = jwt_decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-                    user_id = decoded_data.get('user_id')
-                    if user_id:
-                        from django.contrib.auth import get_user_model
-                        User = get_user_model()
-                        try:
-                            user = User.objects.get(id=user_id)
-                            request.user = user  # Set user on request
-                        except User.DoesNotExist:
-                            pass
-                except Exception:
-                    pass
-
-        if not user or not user.is_authenticated:
+
+        if user is None:
             if path == "/api/check-shop-status/":
                 return self.get_response(request)
             return JsonResponse({"detail": "Authentication required."}, status=401)
 
         # Allow superusers to bypass subscription checks
         if user.is_superuser:
-            print(f"✓ Superuser {user.username} - bypassing subscription check")
+            logger.debug("Superuser %s - bypassing subscription check", user.username)
             return self.get_response(request)
 
         profile = getattr(user, "profile", None)
@@ -89,31 +74,35 @@ class SubscriptionMiddleware(MiddlewareMixin):
             )
 
         shop = profile.shop
-        print(f"Shop: {shop.shop_name}, ID: {shop.shop_id}, Plan: {shop.plan}, Active: {shop.is_active}")
-        print(f"Expire Date: {shop.expire_date}, Today: {date.today()}")
-
-        if shop.plan == "trial" and shop.expire_date and shop.expire_date < date.today():
+        logger.debug(
+            "Shop: %s, ID: %s, Plan: %s, Active: %s, Expire Date: %s",
+            shop.shop_name, shop.shop_id, shop.plan, shop.is_active, shop.expire_date,
+        )
+
+        today = date.today()
+        if shop.plan == "trial" and shop.expire_date and shop.expire_date < today:
+            # Only the flag changes, so skip the full-row save()
             shop.is_active = False
-            shop.save()
+            Shop.objects.filter(pk=shop.pk).update(is_active=False)
 
         if not shop.is_active and hasattr(shop, 'payment_request'):
             pr = shop.payment_request
-            print(f"Payment Request exists: Verified={pr.is_verified}")
+            logger.debug("Payment Request exists: Verified=%s", pr.is_verified)
             
             if pr.is_verified and not shop.is_active:
-                print(f"⚠️ Payment verified but shop not active. Activating now...")
+                logger.debug("Payment verified but shop not active. Activating now...")
                 if shop.plan == "monthly":
                     shop.activate_monthly()
                 elif shop.plan == "yearly":
                     shop.activate_yearly()
                 else:
                     shop.is_active = True
-                    shop.save()
-                print(f"✓ Shop activated after payment verification: {shop.is_active}")
+                    Shop.objects.filter(pk=shop.pk).update(is_active=True)
+                logger.debug("Shop activated after payment verification: %s", shop.is_active)
 
         # Subscription inactive
         if not shop.is_active:
-            print(f"✗ Shop {shop.shop_id} is NOT active after check")
+            logger.debug("Shop %s is NOT active after check", shop.shop_id)
             
             # Check if there's a pending payment request
             if hasattr(shop, 'payment_request'):
@@ -154,7 +143,7 @@ class SubscriptionMiddleware(MiddlewareMixin):
             )
 
         # Subscription expired (for non-trial plans)
-        if shop.expire_date and shop.expire_date < date.today() and shop.plan != "trial":
+        if shop.expire_date and shop.expire_date < today and shop.plan != "trial":
             return JsonResponse(
                 {
                     "detail": "Your subscription has expired. Please renew to continue.",
@@ -166,22 +155,25 @@ class SubscriptionMiddleware(MiddlewareMixin):
                 status=402,
             )
 
-        print(f"✓ Shop {shop.shop_id} is ACTIVE, allowing access")
+        logger.debug("Shop %s is ACTIVE, allowing access", shop.shop_id)
         
         # Add shop info to request for easy access
         request.shop = shop
         return self.get_response(request)
 
     def get_user_from_request(self, request):
-        """Extract user from JWT token if present"""
+        """
+        Resolve the user from the Bearer JWT, or None if it is missing/invalid.
+        This is the only place the middleware verifies tokens.
+        """
         auth_header = request.headers.get('Authorization', '')
         if auth_header.startswith('Bearer '):
             token = auth_header.split(' ')[1]
             try:
-                from rest_framework_simplejwt.authentication import JWTAuthentication
-                jwt_auth = JWTAuthentication()
-                validated_token = jwt_auth.get_validated_token(token)
-                return jwt_auth.get_user(validated_token)
-            except Exception:
-                pass
-        return request.user
\ No newline at end of file
+                user = get_token_user(token)
+            except (InvalidToken, TokenError, User.DoesNotExist, KeyError):
+                return None
+            if user.is_active:
+                request.user = user
+                return user
+        return None
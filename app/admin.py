@@ -1,13 +1,15 @@
 # app/admin.py
-from email.mime import message
-from urllib import request
+import logging
+from datetime import date, timedelta
 from django.contrib import admin
-from rest_framework.utils import timezone
 from .models import (
     Product, ProductVariant, Category, Sale, Customer, Expense, Supplier,
     Purchase, Shop, UserProfile, PaymentRequest, SaleItem,
     PurchaseItem, SupplierPayment, StockLedger, CustomerPayment
 )
+from .backends import get_request_shop
+
+logger = logging.getLogger(__name__)
 
 
 # -------------------------------
@@ -22,16 +24,27 @@ class ShopOwnedAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not request.user.is_superuser:
             # assign this item to the admin's shop
-            if hasattr(request.user, "profile"):
-                obj.shop = request.user.profile.shop
+            shop = get_request_shop(request)
+            if shop is not None:
+                obj.shop = shop
         super().save_model(request, obj, form, change)
 
+    def get_readonly_fields(self, request, obj=None):
+        readonly = super().get_readonly_fields(request, obj)
+        # Shop is required; save_model fills it in for shop admins
+        if not request.user.is_superuser and any(
+            f.name == "shop" for f in self.model._meta.fields
+        ):
+            return (*readonly, "shop")
+        return readonly
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        if hasattr(request.user, "profile"):
-            return qs.filter(shop=request.user.profile.shop)
+        shop = get_request_shop(request)
+        if shop is not None:
+            return qs.filter(shop=shop)
         return qs.none()
 
 
@@ -79,6 +92,7 @@ class ShopAdmin(admin.ModelAdmin):
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "shop", "profile_picture")
+    list_select_related = ("user", "shop")
     search_fields = ("user__username", "shop__shop_name")
     list_filter = ("shop",)
     readonly_fields = ('user', 'shop')
@@ -90,49 +104,31 @@ class UserProfileAdmin(admin.ModelAdmin):
 @admin.register(PaymentRequest)
 class PaymentRequestAdmin(admin.ModelAdmin):
     list_display = ("shop", "method", "amount", "sender_last4", "is_verified", "created_at")
+    list_select_related = ("shop",)
     list_filter = ("method", "is_verified", "created_at")
     search_fields = ("shop__shop_name", "sender_last4", "transaction_id")
     readonly_fields = ("created_at",)
     actions = ['verify_payments']
 
     def verify_payments(self, request, queryset):
+        pending = queryset.filter(is_verified=False)
+        shop_ids = set(pending.values_list("shop_id", flat=True))
+        verified = pending.update(is_verified=True)
+
+        # IMPORTANT: Only activate shops without an active subscription.
+        # Each plan is one UPDATE; the last one catches shops on any other plan.
+        inactive_shops = Shop.objects.filter(id__in=shop_ids, is_active=False)
+        today = date.today()
         activated_shops = 0
-        already_active = 0
-    
-        for payment in queryset:
-            if not payment.is_verified:
-                payment.is_verified = True
-                payment.verified_by = request.user
-                payment.verified_at = timezone.now()
-                payment.save()
-            
-                # Activate shop
-                shop = payment.shop
-            
-            # IMPORTANT: Check if shop already has an active subscription
-                if not shop.is_active:
-                    if shop.plan == "monthly":
-                        shop.activate_monthly()
-                        print(f"✅ Activated monthly subscription for {shop.shop_name}")
-                        activated_shops += 1
-                    elif shop.plan == "yearly":
-                        shop.activate_yearly()
-                        print(f"✅ Activated yearly subscription for {shop.shop_name}")
-                        activated_shops += 1
-                    elif shop.plan == "trial":
-                        shop.activate_trial()
-                        print(f"✅ Activated trial for {shop.shop_name}")
-                        activated_shops += 1
-                    else:
-                        shop.is_active = True
-                        shop.save()
-                        print(f"✅ Activated shop {shop.shop_name}")
-                        activated_shops += 1
-                else:
-                    print(f"⚠️ Shop {shop.shop_name} already active, skipping activation")
-                    already_active += 1
-                
-        message = f"{queryset.count()} payments verified. "
+        for plan, days in Shop.PLAN_DAYS.items():
+            activated_shops += inactive_shops.filter(plan=plan).update(
+                is_active=True, expire_date=today + timedelta(days=days)
+            )
+        activated_shops += inactive_shops.update(is_active=True)
+        already_active = len(shop_ids) - activated_shops
+        logger.debug("Activated %s shops, %s already active", activated_shops, already_active)
+
+        message = f"{verified} payments verified. "
         if activated_shops > 0:
             message += f"{activated_shops} shops activated. "
         if already_active > 0:
@@ -149,6 +145,7 @@ class PaymentRequestAdmin(admin.ModelAdmin):
 @admin.register(Category)
 class CategoryAdmin(ShopOwnedAdmin):
     list_display = ("name", "shop")
+    list_select_related = ("shop",)
     search_fields = ("name",)
     list_filter = ("shop",)
 
@@ -159,6 +156,7 @@ class CategoryAdmin(ShopOwnedAdmin):
 @admin.register(Product)
 class ProductAdmin(ShopOwnedAdmin):
     list_display = ("title", "product_code", "category", "base_unit", "has_variants", "regular_price", "selling_price", "stock", "shop")
+    list_select_related = ("category__shop", "shop")
     list_filter = ("category", "shop", "base_unit", "has_variants", "created_at")
     search_fields = ("title", "product_code", "sku", "barcode")
     readonly_fields = ("created_at", "updated_at")
@@ -187,6 +185,7 @@ class ProductAdmin(ShopOwnedAdmin):
 @admin.register(ProductVariant)
 class ProductVariantAdmin(admin.ModelAdmin):
     list_display = ("product", "variant_name", "sku", "barcode", "purchase_price", "selling_price", "stock")
+    list_select_related = ("product__shop",)
     list_filter = ("product__shop", "created_at")
     search_fields = ("variant_name", "sku", "barcode", "product__title")
     readonly_fields = ("created_at", "updated_at")
@@ -198,6 +197,7 @@ class ProductVariantAdmin(admin.ModelAdmin):
 @admin.register(Sale)
 class SaleAdmin(ShopOwnedAdmin):
     list_display = ("id", "shop", "customer", "date", "total", "discount", "redeemed_points", "earned_points")
+    list_select_related = ("customer__shop", "shop")
     list_filter = ("date", "shop")
     search_fields = ("customer__name", "customer__phone")
     readonly_fields = ("subtotal", "total", "earned_points", "date")
@@ -221,6 +221,7 @@ class SaleAdmin(ShopOwnedAdmin):
 @admin.register(SaleItem)
 class SaleItemAdmin(ShopOwnedAdmin):
     list_display = ("sale", "product", "quantity", "price", "total")
+    list_select_related = ("sale__shop", "product__shop")
     list_filter = ("sale__shop", "sale__date")
     search_fields = ("product__title", "sale__id")
     readonly_fields = ("total",)
@@ -232,6 +233,7 @@ class SaleItemAdmin(ShopOwnedAdmin):
 @admin.register(Customer)
 class CustomerAdmin(ShopOwnedAdmin):
     list_display = ("name", "phone", "points", "shop", "created_at")
+    list_select_related = ("shop",)
     list_filter = ("shop", "created_at")
     search_fields = ("name", "phone")
     readonly_fields = ("created_at", "updated_at", "points")
@@ -243,6 +245,7 @@ class CustomerAdmin(ShopOwnedAdmin):
 @admin.register(Expense)
 class ExpenseAdmin(ShopOwnedAdmin):
     list_display = ("date", "category", "amount", "payment_method", "shop", "added_by")
+    list_select_related = ("shop", "added_by")
     list_filter = ("category", "payment_method", "shop", "date")
     search_fields = ("category", "description")
     readonly_fields = ("date", "added_by")
@@ -254,6 +257,7 @@ class ExpenseAdmin(ShopOwnedAdmin):
 @admin.register(Supplier)
 class SupplierAdmin(ShopOwnedAdmin):
     list_display = ("name", "phone", "shop", "created_at")
+    list_select_related = ("shop",)
     list_filter = ("shop", "created_at")
     search_fields = ("name", "phone", "address")
     readonly_fields = ("created_at",)
@@ -265,6 +269,7 @@ class SupplierAdmin(ShopOwnedAdmin):
 @admin.register(Purchase)
 class PurchaseAdmin(ShopOwnedAdmin):
     list_display = ("invoice_no", "supplier", "date", "total", "paid_amount", "due_amount", "shop")
+    list_select_related = ("supplier__shop", "shop")
     list_filter = ("date", "supplier", "shop", "payment_method")
     search_fields = ("invoice_no", "supplier__name", "remarks")
     readonly_fields = ("subtotal", "total", "due_amount", "created_at")
@@ -295,6 +300,7 @@ class PurchaseAdmin(ShopOwnedAdmin):
 @admin.register(PurchaseItem)
 class PurchaseItemAdmin(ShopOwnedAdmin):
     list_display = ("purchase", "product", "product_variant", "pack_unit", "qty_packs", "price_per_pack", "total_base_qty", "total")
+    list_select_related = ("purchase__supplier", "purchase__shop", "product__shop", "product_variant__product")
     list_filter = ("purchase__shop", "purchase__date", "pack_unit")
     search_fields = ("product__title", "product_variant__variant_name", "purchase__invoice_no", "batch_no")
     readonly_fields = ("total", "total_base_qty", "cost_per_base_unit")
@@ -306,6 +312,7 @@ class PurchaseItemAdmin(ShopOwnedAdmin):
 @admin.register(SupplierPayment)
 class SupplierPaymentAdmin(ShopOwnedAdmin):
     list_display = ("supplier", "date", "amount", "payment_method", "shop", "memo_no")
+    list_select_related = ("supplier__shop", "shop")
     list_filter = ("date", "supplier", "shop", "payment_method")
     search_fields = ("supplier__name", "memo_no", "remarks")
     readonly_fields = ("date",)
@@ -317,6 +324,7 @@ class SupplierPaymentAdmin(ShopOwnedAdmin):
 @admin.register(CustomerPayment)
 class CustomerPaymentAdmin(ShopOwnedAdmin):
     list_display = ("customer", "date", "amount", "payment_method", "shop", "memo_no")
+    list_select_related = ("customer__shop", "shop")
     list_filter = ("date", "customer", "shop", "payment_method")
     search_fields = ("customer__name", "memo_no", "remarks")
     readonly_fields = ("date",)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PosAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
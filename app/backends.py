@@ -1,36 +1,152 @@
 # app/backends.py
+import hashlib
+import time
+
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 
 User = get_user_model()
 
+# Every API request reads user.profile.shop, so load them with the user
+USER_RELATED = ("profile__shop",)
+
+# Resolved JWTs are cached briefly so SubscriptionMiddleware and DRF
+# authentication, and repeat requests from the same client, share one
+# signature verification and auth_user lookup.
+JWT_CACHE_TTL = 5
+
+
+def _token_cache_key(raw_token):
+    """Cache key for a raw JWT (hashed, the token itself is never stored)"""
+    return "jwt:" + hashlib.blake2b(raw_token, digest_size=16).hexdigest()
+
+
+def _user_cache_key(user_id):
+    return f"jwt-user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """Fetch a user by id, served from the short-TTL cache when possible"""
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.select_related(*USER_RELATED).get(
+            **{api_settings.USER_ID_FIELD: user_id}
+        )
+        cache.set(key, user, JWT_CACHE_TTL)
+    return user
+
+
+def get_token_user(raw_token):
+    """
+    The user an access token belongs to, verifying the token at most once
+    per JWT_CACHE_TTL. Raises InvalidToken for a bad token and
+    User.DoesNotExist when its user is gone.
+    """
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    key = _token_cache_key(raw_token)
+    user_id = cache.get(key)
+    if user_id is None:
+        validated_token = _token_validator.get_validated_token(raw_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        # Never keep a token around past its own expiry
+        ttl = min(JWT_CACHE_TTL, int(validated_token["exp"] - time.time()))
+        if ttl > 0:
+            cache.set(key, user_id, ttl)
+    return get_cached_user(user_id)
+
+
+def get_request_shop(request):
+    """The request user's shop, resolved once and kept on the request"""
+    try:
+        return request._shop
+    except AttributeError:
+        pass
+    profile = getattr(request.user, "profile", None)
+    request._shop = profile.shop if profile else None
+    return request._shop
+
+
 class ShopAwareAuthenticationBackend(ModelBackend):
     """
     Allows login by username OR email.
-    Blocks login if shop subscription inactive (except superuser/staff).
+    The shop subscription is checked by LoginView, the same way for both,
+    so inactive shops get its 402 responses (and verified payments their
+    activation) instead of a credentials error.
     """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None or password is None:
             return None
 
+        # Username first, then email: each lookup uses a single index
+        # instead of an OR across both columns
+        users = User.objects.select_related(*USER_RELATED)
         try:
-            user = User.objects.get(Q(username=username) | Q(email=username))
+            user = users.get(username=username)
         except User.DoesNotExist:
-            return None
+            try:
+                user = users.get(email=username)
+            except (User.DoesNotExist, User.MultipleObjectsReturned):
+                return None
 
         if not user.check_password(password):
             return None
 
-        # ✅ allow admin/staff always
-        if user.is_superuser or user.is_staff:
-            return user
+        return user
 
-        # ✅ block inactive shop users
-        if hasattr(user, "profile") and hasattr(user.profile, "shop"):
-            shop = user.profile.shop
-            if not shop.is_active:
-                return user
+
+class ShopAwareJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that fetches the user's profile and shop in the
+    same query as the user, through the token/user cache shared with
+    SubscriptionMiddleware.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        try:
+            user = get_token_user(raw_token)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Nothing reads request.auth; a cached token isn't decoded again
+        return user, None
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = get_cached_user(user_id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
 
         return user
+
+
+_token_validator = JWTAuthentication()
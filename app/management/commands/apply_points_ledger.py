@@ -0,0 +1,23 @@
+# app/management/commands/apply_points_ledger.py
+from django.core.management.base import BaseCommand
+
+from app.models import PointsLedger
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold unapplied PointsLedger rows into Customer.points. "
+        "Run every few minutes by points-ledger.timer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Customers updated per UPDATE statement",
+        )
+
+    def handle(self, *args, **options):
+        rows, customers = PointsLedger.apply_pending(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Applied {rows} points entries to {customers} customers"
+        ))
@@ -0,0 +1,63 @@
+# app/management/commands/rebuild_cash_running_balance.py
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from app.models import CashTransaction, Shop, ShopBalance, ZERO
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute CashTransaction.running_balance for every shop with one "
+        "window-function UPDATE, then resync ShopBalance."
+    )
+
+    def handle(self, *args, **options):
+        qn = connection.ops.quote_name
+        table = qn(CashTransaction._meta.db_table)
+        # Same chain as CashTransaction.save: per shop, in insertion (pk) order
+        running = f"""
+            SELECT id, SUM(CASE WHEN transaction_type = 'credit' THEN amount ELSE -amount END)
+                OVER (PARTITION BY shop_id ORDER BY id) AS balance
+            FROM {table}
+        """
+        if connection.vendor == "mysql":
+            sql = f"""
+                UPDATE {table} ct JOIN ({running}) t ON ct.id = t.id
+                SET ct.running_balance = t.balance
+            """
+        else:
+            sql = f"""
+                UPDATE {table} SET running_balance = t.balance
+                FROM ({running}) t WHERE {table}.id = t.id
+            """
+
+        with transaction.atomic():
+            # Ledger writes lock their shop's ShopBalance row; hold them all
+            list(ShopBalance.objects.select_for_update().values_list("pk", flat=True))
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+                updated = cursor.rowcount
+
+            shop_ids = set(
+                CashTransaction.objects.order_by().values_list("shop_id", flat=True).distinct()
+            )
+            ShopBalance.objects.bulk_create(
+                [ShopBalance(shop_id=shop_id) for shop_id in shop_ids],
+                ignore_conflicts=True,
+            )
+            latest = (
+                CashTransaction.objects.filter(shop_id=OuterRef("shop_id"))
+                .order_by("-pk")
+                .values("running_balance")[:1]
+            )
+            ShopBalance.objects.update(balance=Coalesce(Subquery(latest), Value(ZERO)))
+
+        cache.delete_many(
+            [CashTransaction._balance_cache_key(pk) for pk in Shop.objects.values_list("pk", flat=True)]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt running balances ({updated} transactions, {len(shop_ids)} shops)"
+        ))
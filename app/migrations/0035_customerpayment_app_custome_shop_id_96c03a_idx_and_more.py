@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0034_cashtransaction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customerpayment',
+            index=models.Index(fields=['shop', '-date'], name='app_custome_shop_id_96c03a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['shop', '-date'], name='app_expense_shop_id_908be4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['shop', 'barcode'], name='app_product_shop_id_9d51a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['shop', 'sku'], name='app_product_shop_id_29c9fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['shop', '-date'], name='app_purchas_shop_id_cc4112_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['shop', '-date'], name='app_sale_shop_id_8644af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplierpayment',
+            index=models.Index(fields=['shop', '-date'], name='app_supplie_shop_id_b50776_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:37
+
+import django.db.models.expressions
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0035_customerpayment_app_custome_shop_id_96c03a_idx_and_more'),
+    ]
+
+    # A regular column can't be altered into a generated one, so it is
+    # dropped and re-added; the values are recomputed from total.
+    operations = [
+        migrations.RemoveField(
+            model_name='sale',
+            name='earned_points',
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='earned_points',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.math.Floor(django.db.models.expressions.CombinedExpression(models.F('total'), '/', models.Value(100))), output_field=models.PositiveIntegerField()),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0036_sale_earned_points_generated'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0037_customer_created_at_auto_now_add'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='app_expense_shop_id_908be4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='purchase',
+            name='app_purchas_shop_id_cc4112_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sale',
+            name='app_sale_shop_id_8644af_idx',
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['shop', '-date', 'amount', 'category'], name='expense_shop_date_covering'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['shop', '-date', 'total', 'supplier'], name='purchase_shop_date_covering'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['shop', '-date', 'total', 'customer', 'payment_method'], name='sale_shop_date_covering'),
+        ),
+    ]
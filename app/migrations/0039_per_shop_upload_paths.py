@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:42
+
+import app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0038_shop_date_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paymentrequest',
+            name='screenshot',
+            field=models.ImageField(blank=True, null=True, upload_to=app.models._payment_upload),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to=app.models._product_upload),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, upload_to=app.models._profile_upload),
+        ),
+    ]
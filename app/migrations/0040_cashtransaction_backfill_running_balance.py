@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:44
+
+from decimal import Decimal
+
+from django.db import migrations
+
+
+def backfill_running_balance(apps, schema_editor):
+    """Chain running_balance per shop in insertion (pk) order"""
+    CashTransaction = apps.get_model('app', 'CashTransaction')
+    batch = []
+    shop_id, balance = None, Decimal('0.00')
+    rows = CashTransaction.objects.order_by('shop_id', 'pk').only(
+        'pk', 'shop_id', 'transaction_type', 'amount', 'running_balance'
+    )
+    for row in rows.iterator(chunk_size=2000):
+        if row.shop_id != shop_id:
+            shop_id, balance = row.shop_id, Decimal('0.00')
+        balance += row.amount if row.transaction_type == 'credit' else -row.amount
+        row.running_balance = balance
+        batch.append(row)
+        if len(batch) >= 1000:
+            CashTransaction.objects.bulk_update(batch, ['running_balance'])
+            batch = []
+    if batch:
+        CashTransaction.objects.bulk_update(batch, ['running_balance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0039_per_shop_upload_paths'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_running_balance, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_shop_balances(apps, schema_editor):
+    """Seed each shop's balance from its latest running_balance"""
+    CashTransaction = apps.get_model('app', 'CashTransaction')
+    ShopBalance = apps.get_model('app', 'ShopBalance')
+    shop_ids = CashTransaction.objects.order_by().values_list('shop_id', flat=True).distinct()
+    ShopBalance.objects.bulk_create(
+        ShopBalance(
+            shop_id=shop_id,
+            balance=CashTransaction.objects.filter(shop_id=shop_id)
+            .order_by('-pk')
+            .values_list('running_balance', flat=True)
+            .first(),
+        )
+        for shop_id in shop_ids
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0040_cashtransaction_backfill_running_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShopBalance',
+            fields=[
+                ('shop', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cash_balance', serialize=False, to='app.shop')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_shop_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0041_shopbalance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockledger',
+            index=models.Index(fields=['shop', 'product', 'expiry_date', 'remaining_qty'], name='sl_fefo_prod'),
+        ),
+        migrations.AddIndex(
+            model_name='stockledger',
+            index=models.Index(fields=['shop', 'product_variant', 'expiry_date', 'remaining_qty'], name='sl_fefo_var'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:50
+
+from django.db import migrations, models
+
+
+def backfill_display_titles(apps, schema_editor):
+    """Fill display_title for existing rows (same format as the models' save)"""
+    Purchase = apps.get_model('app', 'Purchase')
+    StockLedger = apps.get_model('app', 'StockLedger')
+
+    purchases = []
+    for p in Purchase.objects.select_related('supplier', 'shop').iterator(chunk_size=2000):
+        p.display_title = f"{p.invoice_no} | {p.supplier.name} [{p.shop.shop_id if p.shop else 'No Shop'}]"
+        purchases.append(p)
+        if len(purchases) >= 1000:
+            Purchase.objects.bulk_update(purchases, ['display_title'])
+            purchases = []
+    Purchase.objects.bulk_update(purchases, ['display_title'])
+
+    entries = []
+    rows = StockLedger.objects.select_related('product', 'product_variant__product')
+    for e in rows.iterator(chunk_size=2000):
+        if e.product_id:
+            target = e.product.title
+        elif e.product_variant_id:
+            target = f"{e.product_variant.product.title} - {e.product_variant.variant_name}"
+        else:
+            target = 'Unknown'
+        e.display_title = f"{target} | {e.transaction_type} | {e.quantity}"
+        entries.append(e)
+        if len(entries) >= 1000:
+            StockLedger.objects.bulk_update(entries, ['display_title'])
+            entries = []
+    StockLedger.objects.bulk_update(entries, ['display_title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0042_stockledger_fefo_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='display_title',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='stockledger',
+            name='display_title',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_display_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0043_display_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShopIdSequence',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='shop',
+            name='shop_id',
+            field=models.CharField(blank=True, max_length=6, unique=True),
+        ),
+    ]
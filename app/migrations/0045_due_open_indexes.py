@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0044_shop_id_sequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['shop', 'due_amount', 'date'], name='purchase_due_open'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['shop', 'due_amount', 'date'], name='sale_due_open'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0045_due_open_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cashtransaction',
+            name='app_cashtra_shop_id_5d9997_idx',
+        ),
+        migrations.AddIndex(
+            model_name='cashtransaction',
+            index=models.Index(fields=['shop', '-date', '-created_at'], name='ct_shop_recent'),
+        ),
+    ]
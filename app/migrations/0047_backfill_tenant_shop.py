@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:56
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+TENANT_MODELS = [
+    'Category', 'Product', 'Customer', 'Sale', 'Expense',
+    'Supplier', 'Purchase', 'SupplierPayment', 'CustomerPayment', 'StockLedger',
+]
+
+
+def _fill(model, source, value='shop_id', **match):
+    """Set model.shop on rows still missing it from the first matching source row"""
+    lookups = {field: OuterRef(ref) for field, ref in match.items()}
+    shop = (
+        source.objects.filter(**lookups, **{f'{value}__isnull': False})
+        .order_by()
+        .values(value)[:1]
+    )
+    model.objects.filter(shop__isnull=True).update(shop=Subquery(shop))
+
+
+def backfill_shop(apps, schema_editor):
+    """Infer shop for legacy rows from the rows they are attached to"""
+    m = {name: apps.get_model('app', name) for name in TENANT_MODELS}
+    SaleItem = apps.get_model('app', 'SaleItem')
+    PurchaseItem = apps.get_model('app', 'PurchaseItem')
+    ProductVariant = apps.get_model('app', 'ProductVariant')
+    UserProfile = apps.get_model('app', 'UserProfile')
+
+    # Parties first, from their documents, then the documents from the parties
+    _fill(m['Customer'], m['Sale'], customer_id='pk')
+    _fill(m['Customer'], m['CustomerPayment'], customer_id='pk')
+    _fill(m['Sale'], m['Customer'], pk='customer_id')
+    _fill(m['Sale'], SaleItem, 'product__shop_id', sale_id='pk')
+    _fill(m['CustomerPayment'], m['Customer'], pk='customer_id')
+
+    _fill(m['Supplier'], m['Purchase'], supplier_id='pk')
+    _fill(m['Supplier'], m['SupplierPayment'], supplier_id='pk')
+    _fill(m['Purchase'], m['Supplier'], pk='supplier_id')
+    _fill(m['Purchase'], PurchaseItem, 'product__shop_id', purchase_id='pk')
+    _fill(m['SupplierPayment'], m['Supplier'], pk='supplier_id')
+
+    _fill(m['Product'], m['Category'], pk='category_id')
+    _fill(m['Product'], SaleItem, 'sale__shop_id', product_id='pk')
+    _fill(m['Product'], PurchaseItem, 'purchase__shop_id', product_id='pk')
+    _fill(m['Category'], m['Product'], category_id='pk')
+
+    _fill(m['StockLedger'], m['Product'], pk='product_id')
+    _fill(m['StockLedger'], ProductVariant, 'product__shop_id', pk='product_variant_id')
+    _fill(m['StockLedger'], PurchaseItem, 'purchase__shop_id', pk='purchase_item_id')
+
+    _fill(m['Expense'], UserProfile, user_id='added_by_id')
+
+    orphans = {
+        name: count for name, model in m.items()
+        if (count := model.objects.filter(shop__isnull=True).count())
+    }
+    if orphans:
+        raise RuntimeError(
+            "Rows with no shop that could not be inferred: %s. "
+            "Assign them a shop or delete them, then rerun migrate."
+            % ", ".join(f"{name}={count}" for name, count in orphans.items())
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0046_cashtransaction_shop_recent'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_shop, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0047_backfill_tenant_shop'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='customerpayment',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='stockledger',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='supplier',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+        migrations.AlterField(
+            model_name='supplierpayment',
+            name='shop',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop'),
+        ),
+    ]
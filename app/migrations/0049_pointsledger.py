@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 04:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0048_shop_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('applied', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_ledger', to='app.customer')),
+                ('sale', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='app.sale')),
+                ('shop', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.shop')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['applied', 'customer'], name='pl_pending')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 05:01
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_selling_price(apps, schema_editor):
+    """Same default as Product.save, for rows written without it"""
+    Product = apps.get_model('app', 'Product')
+    money = models.DecimalField(max_digits=10, decimal_places=2)
+    Product.objects.filter(selling_price__isnull=True).update(
+        selling_price=Greatest(
+            Value(Decimal('0.00'), output_field=money),
+            F('regular_price') - Coalesce(F('discount'), Value(Decimal('0.00'), output_field=money)),
+            output_field=money,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0049_pointsledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_selling_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 05:45
+
+from django.db import migrations
+
+
+def relabel_purchases(apps, schema_editor):
+    """Show the shop's shop_id code in stored purchase titles, as Purchase.save does"""
+    Purchase = apps.get_model('app', 'Purchase')
+
+    purchases = []
+    for p in Purchase.objects.select_related('supplier', 'shop').iterator(chunk_size=2000):
+        p.display_title = f"{p.invoice_no} | {p.supplier.name} [{p.shop.shop_id}]"
+        purchases.append(p)
+        if len(purchases) >= 1000:
+            Purchase.objects.bulk_update(purchases, ['display_title'])
+            purchases = []
+    Purchase.objects.bulk_update(purchases, ['display_title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0050_product_selling_price_backfill'),
+    ]
+
+    operations = [
+        migrations.RunPython(relabel_purchases, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,99 @@
 # app/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Floor, Greatest
 from django.utils import timezone
 from django.conf import settings
-from decimal import Decimal
+from django.core.cache import cache
+from collections import defaultdict
+from decimal import Decimal, localcontext
 from datetime import date, timedelta
-from django.contrib.auth import get_user_model
-import random
+import os
 
-User = get_user_model()
+# Money stays DecimalField rather than integer cents: MySQL packs DECIMAL(12|14, 2)
+# into 6-7 fixed bytes (less than a BIGINT) and the API already speaks decimals.
+# Shared zero for money fields; Decimals are immutable, so one instance will do
+ZERO = Decimal("0.00")
+
+
+def list_cache_key(kind, shop_id):
+    """Cache key for a shop's unfiltered list of `kind` ('sale' or 'cash')"""
+    return f"{kind}-list:{shop_id}"
+
+
+def invalidate_list_cache(shop_id, *kinds):
+    """Drop a shop's cached lists once the surrounding transaction commits"""
+    if not settings.LIST_CACHE_TTL or not shop_id:
+        return
+    keys = [list_cache_key(kind, shop_id) for kind in kinds]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedStrMixin:
+    """
+    Memoizes __str__ per instance for models whose label follows relations.
+    Subclasses implement _build_str(); save() drops the cached value.
+    """
+
+    def __str__(self):
+        s = self.__dict__.get("_str_cache")
+        if s is None:
+            s = self.__dict__["_str_cache"] = self._build_str()
+        return s
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop("_str_cache", None)
+        return super().save(*args, **kwargs)
+
+
+# Uploads are grouped per tenant. These read the stored shop_id FK column,
+# never instance.shop, so saving a file doesn't load the Shop row.
+def _product_upload(instance, filename):
+    return f"products/{instance.shop_id or 0}/{os.path.basename(filename)}"
+
+
+def _payment_upload(instance, filename):
+    return f"payments/{instance.shop_id or 0}/{os.path.basename(filename)}"
+
+
+def _profile_upload(instance, filename):
+    return f"profile_pics/{instance.shop_id or 0}/{os.path.basename(filename)}"
 
 
 # ============================================================
 # SHOP (TENANT) MODEL
 # ============================================================
+class ShopIdSequence(models.Model):
+    """
+    Counter for new shop ids. MySQL has no sequences, so each allocation
+    inserts a row and takes its auto-increment id.
+    """
+    id = models.BigAutoField(primary_key=True)
+
+
+SHOP_ID_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# 6-char base36 ids from "A00000" up: they always start with a letter, so
+# they never clash with the older all-digit ids
+SHOP_ID_FIRST = 10 * 36 ** 5
+SHOP_ID_SPAN = 36 ** 6 - SHOP_ID_FIRST
+# Coprime with SHOP_ID_SPAN, so n -> n * STEP % SPAN is a permutation; it
+# scatters consecutive shops so ids don't reveal the signup order
+SHOP_ID_STEP = 1_000_000_007
+
+
+def encode_shop_id(n):
+    """Map sequence number n to its unique 6-char shop id"""
+    n = SHOP_ID_FIRST + (n * SHOP_ID_STEP) % SHOP_ID_SPAN
+    chars = []
+    while n:
+        n, r = divmod(n, 36)
+        chars.append(SHOP_ID_ALPHABET[r])
+    return "".join(reversed(chars))
+
+
 def generate_shop_id():
-    return str(random.randint(100000, 999999))
+    """Allocate the next shop id (one INSERT, no collision retries)"""
+    return encode_shop_id(ShopIdSequence.objects.create().pk)
 
 
 class Shop(models.Model):
@@ -24,7 +103,15 @@ class Shop(models.Model):
         ("yearly", "Yearly 7990 BDT"),
     ]
 
-    shop_id = models.CharField(max_length=6, unique=True, default=generate_shop_id)
+    # Subscription length in days for each plan
+    PLAN_DAYS = {
+        "trial": 7,
+        "monthly": 30,
+        "yearly": 365,
+    }
+
+    # Allocated in save() so unsaved instances don't consume ids
+    shop_id = models.CharField(max_length=6, unique=True, blank=True)
     shop_name = models.CharField(max_length=120)
     location = models.CharField(max_length=255, blank=True, null=True)
     phone = models.CharField(max_length=11)
@@ -43,24 +130,25 @@ class Shop(models.Model):
     def activate_trial(self):
         self.plan = "trial"
         self.is_active = True
-        self.expire_date = date.today() + timedelta(days=7)
-        self.save()
+        self.expire_date = date.today() + timedelta(days=self.PLAN_DAYS["trial"])
+        self.save(update_fields=["plan", "is_active", "expire_date"])
 
     def activate_monthly(self):
         self.plan = "monthly"
         self.is_active = True
-        self.expire_date = date.today() + timedelta(days=30)
-        self.save()
+        self.expire_date = date.today() + timedelta(days=self.PLAN_DAYS["monthly"])
+        self.save(update_fields=["plan", "is_active", "expire_date"])
 
     def activate_yearly(self):
         self.plan = "yearly"
         self.is_active = True
-        self.expire_date = date.today() + timedelta(days=365)
-        self.save()
+        self.expire_date = date.today() + timedelta(days=self.PLAN_DAYS["yearly"])
+        self.save(update_fields=["plan", "is_active", "expire_date"])
     
     def save(self, *args, **kwargs):
-        # Compress logo if it exists
-        if self.logo:
+        # Compress logo if it exists and is being saved
+        update_fields = kwargs.get('update_fields')
+        if (update_fields is None or 'logo' in update_fields) and self.logo:
             from .utils import compress_and_resize_image
             self.logo = compress_and_resize_image(
                 self.logo,
@@ -70,6 +158,9 @@ class Shop(models.Model):
                 min_size_kb=15,
                 target_size_kb=30
             )
+
+        if not self.shop_id:
+            self.shop_id = generate_shop_id()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -79,8 +170,8 @@ class Shop(models.Model):
 # ============================================================
 # USER PROFILE (USER → SHOP)
 # ============================================================
-class UserProfile(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
+class UserProfile(CachedStrMixin, models.Model):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile")
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name="users")
     role = models.CharField(
        max_length=20,
@@ -92,7 +183,7 @@ class UserProfile(models.Model):
        ],
        default="admin")
     is_owner = models.BooleanField(default=False)
-    profile_picture = models.ImageField(upload_to="profile_pics/", blank=True, null=True)
+    profile_picture = models.ImageField(upload_to=_profile_upload, blank=True, null=True)
     
     # Permissions
     can_manage_products = models.BooleanField(default=False)
@@ -100,12 +191,12 @@ class UserProfile(models.Model):
     can_manage_purchases = models.BooleanField(default=False)
     can_view_reports = models.BooleanField(default=False)
 
-    def __str__(self):
+    def _build_str(self):
         return f"{self.user.username} → {self.shop.shop_name} ({self.role})"
 # ============================================================
 # MANUAL PAYMENT REQUEST
 # ============================================================
-class PaymentRequest(models.Model):
+class PaymentRequest(CachedStrMixin, models.Model):
     PAYMENT_METHODS = [
         ("bkash", "bKash"),
         ("nagad", "Nagad"),
@@ -122,12 +213,12 @@ class PaymentRequest(models.Model):
     sender_last4 = models.CharField(max_length=4, blank=True, null=True)
     amount = models.PositiveIntegerField()
     transaction_id = models.CharField(max_length=50, blank=True, null=True)
-    screenshot = models.ImageField(upload_to="payments/", blank=True, null=True)
+    screenshot = models.ImageField(upload_to=_payment_upload, blank=True, null=True)
 
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def __str__(self):
+    def _build_str(self):
         return f"{self.shop.shop_name} Payment ({self.method})"
 
 
@@ -135,7 +226,7 @@ class PaymentRequest(models.Model):
 # CATEGORY
 # ============================================================
 class Category(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
 
     class Meta:
@@ -143,12 +234,22 @@ class Category(models.Model):
         unique_together = ('shop', 'name')
 
     def __str__(self):
-        return f"{self.name} ({self.shop.shop_id if self.shop else 'No Shop'})"
+        return f"{self.name} ({self.shop.shop_id})"
 
 
 # ============================================================
 # PRODUCT
 # ============================================================
+class ProductManager(models.Manager):
+    """
+    Leaves the image column out of product queries; stock/price lookups
+    never need it. Use .defer(None) where the image is rendered.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer('image')
+
+
 class Product(models.Model):
     BASE_UNIT_CHOICES = [
         ('pcs', 'Pieces'),
@@ -158,7 +259,7 @@ class Product(models.Model):
         ('ml', 'Milliliter'),
     ]
     
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     product_code = models.CharField(max_length=50)
     sku = models.CharField(max_length=50, blank=True, null=True)
@@ -174,7 +275,7 @@ class Product(models.Model):
     selling_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
-    image = models.ImageField(upload_to="products/", blank=True, null=True)
+    image = models.ImageField(upload_to=_product_upload, blank=True, null=True)
     
     # Changed to DecimalField to support weight units (kg, g, ltr, ml)
     stock = models.DecimalField(max_digits=12, decimal_places=3, default=0)
@@ -189,12 +290,23 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductManager()
+
     class Meta:
         unique_together = ('shop', 'product_code')
+        indexes = [
+            models.Index(fields=['shop', 'barcode']),
+            models.Index(fields=['shop', 'sku']),
+        ]
 
     def save(self, *args, **kwargs):
-        # Compress image if it exists
-        if self.image:
+        # Compress image if it exists (and is actually loaded and being saved)
+        update_fields = kwargs.get('update_fields')
+        if (
+            'image' not in self.get_deferred_fields()
+            and (update_fields is None or 'image' in update_fields)
+            and self.image
+        ):
             from .utils import compress_and_resize_image
             self.image = compress_and_resize_image(
                 self.image,
@@ -205,18 +317,20 @@ class Product(models.Model):
                 target_size_kb=30
             )
         
-        if self.selling_price is None:
+        # selling_price stays a regular column (it can be set explicitly);
+        # only default it when the column is part of this write
+        if (update_fields is None or 'selling_price' in update_fields) and self.selling_price is None:
             self.selling_price = max(0, self.regular_price - (self.discount or 0))
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.title} ({self.shop.shop_id if self.shop else 'No Shop'})"
+        return f"{self.title} ({self.shop.shop_id})"
 
 
 # ============================================================
 # PRODUCT VARIANT
 # ============================================================
-class ProductVariant(models.Model):
+class ProductVariant(CachedStrMixin, models.Model):
     """
     Optional variants for products (size/color/strength/ml)
     Each variant has separate SKU/barcode and stock
@@ -242,35 +356,95 @@ class ProductVariant(models.Model):
         unique_together = ('product', 'variant_name')
         ordering = ['variant_name']
 
-    def __str__(self):
+    def _build_str(self):
         return f"{self.product.title} - {self.variant_name}"
 
 
 # ============================================================
 # CUSTOMER
 # ============================================================
+class CustomerManager(models.Manager):
+    def with_totals(self):
+        """
+        Annotate total_sales, total_paid (paid at sale plus later payments),
+        total_due and last_sale_date from the customer's own shop. Each sum
+        is its own correlated subquery, as in SupplierManager.with_totals.
+        """
+        money = models.DecimalField(max_digits=14, decimal_places=2)
+
+        def per_customer(model, aggregate, output_field):
+            rows = (
+                model.objects.filter(customer=OuterRef('pk'), shop=OuterRef('shop'))
+                .order_by()
+                .values('customer')
+                .annotate(s=aggregate)
+                .values('s')
+            )
+            return Subquery(rows, output_field=output_field)
+
+        def total(model, field):
+            return Coalesce(
+                per_customer(model, models.Sum(field), money),
+                Value(ZERO), output_field=money,
+            )
+
+        return self.get_queryset().annotate(
+            total_sales=total(Sale, 'total'),
+            total_paid=models.ExpressionWrapper(
+                total(Sale, 'paid_amount') + total(CustomerPayment, 'amount'),
+                output_field=money,
+            ),
+            last_sale_date=per_customer(Sale, models.Max('date'), models.DateTimeField()),
+        ).annotate(
+            total_due=models.ExpressionWrapper(
+                F('total_sales') - F('total_paid'), output_field=money
+            ),
+        )
+
+
 class Customer(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
     phone = models.CharField(max_length=20)
     points = models.PositiveIntegerField(default=0)
 
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CustomerManager()
+
     class Meta:
         unique_together = ("shop", "phone")
         ordering = ["-created_at"]
 
     def __str__(self):
-        return f"{self.name} ({self.phone}) [{self.shop.shop_id if self.shop else 'No Shop'}]"
+        return f"{self.name} ({self.phone}) [{self.shop.shop_id}]"
+
+    @classmethod
+    def get_for_sale(cls, shop, phone, name=None):
+        """
+        Get (or create) and lock the shop's customer with this phone for the
+        rest of the sale's transaction, renaming it if the sale carries a
+        different name. Unchanged repeat customers cost a single query.
+        """
+        customer, created = cls.objects.select_for_update().get_or_create(
+            shop=shop, phone=phone, defaults={"name": name or phone},
+        )
+        if not created and name and customer.name != name:
+            customer.name = name
+            customer.save(update_fields=["name", "updated_at"])
+        return customer
 
 
 # ============================================================
 # SALE + SALE ITEMS
 # ============================================================
+# Sale total (Tk) that earns one loyalty point
+POINT_VALUE = 100
+
+
 class Sale(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     customer = models.ForeignKey(Customer, on_delete=models.SET_NULL, null=True, blank=True)
 
     date = models.DateTimeField(auto_now_add=True)
@@ -313,36 +487,115 @@ class Sale(models.Model):
     )
     
     redeemed_points = models.PositiveIntegerField(default=0)
-    earned_points = models.PositiveIntegerField(default=0)
+    # 1 point per POINT_VALUE Tk, computed by the database from total
+    earned_points = models.GeneratedField(
+        expression=Floor(F('total') / POINT_VALUE),
+        output_field=models.PositiveIntegerField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        # Trailing columns make the daily report queries index-only
+        # (MySQL has no INCLUDE, so they are key columns)
+        indexes = [
+            models.Index(
+                fields=['shop', '-date', 'total', 'customer', 'payment_method'],
+                name='sale_shop_date_covering',
+            ),
+            # Open dues: due_amount > 0 is a range on the second column
+            models.Index(fields=['shop', 'due_amount', 'date'], name='sale_due_open'),
+        ]
     
+    # Columns paid_amount/due_amount are derived from
+    PAYMENT_FIELDS = frozenset({"total", "paid_amount", "payment_method"})
+    # Columns that decide how many points a sale moves on its customer
+    POINTS_FIELDS = frozenset({"customer", "customer_id", "total", "redeemed_points"})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this sale has applied to its customer's points, so
+        # a later save only moves the difference
+        if {"customer_id", "earned_points", "redeemed_points"}.issubset(field_names):
+            instance._points_applied = (
+                instance.customer_id, instance.earned_points, instance.redeemed_points
+            )
+        return instance
+
     def save(self, *args, **kwargs):
-        # calculate points
-        self.earned_points = int(self.total // 100)
-
-        # ✅ Payment logic - This should match your serializer logic
-        if self.payment_method != "due":
-            # For non-due payments, paid_amount should equal total
-            self.paid_amount = Decimal(self.total or 0)
-            self.due_amount = Decimal("0.00")
-        else:
-            # For due payments, use the provided paid_amount
-            # (if any partial payment was made)
-            self.paid_amount = Decimal(self.paid_amount or 0)
-            self.due_amount = Decimal(self.total or 0) - Decimal(self.paid_amount or 0)
-
-        # customer points update
-        if self.customer:
-            if self.redeemed_points > 0:
-                self.customer.points = max(0, self.customer.points - self.redeemed_points)
-            self.customer.points += self.earned_points
-            self.customer.save()
+        update_fields = kwargs.get('update_fields')
+
+        # ✅ Payment logic - This should match your serializer logic.
+        # Targeted saves of other columns (trx_id, due_amount, ...) skip it.
+        if update_fields is None or not self.PAYMENT_FIELDS.isdisjoint(update_fields):
+            if self.payment_method != "due":
+                # For non-due payments, paid_amount should equal total
+                self.paid_amount = self.total if self.total is not None else ZERO
+                self.due_amount = ZERO
+            else:
+                # For due payments, use the provided paid_amount
+                # (if any partial payment was made)
+                self.paid_amount = self.paid_amount or ZERO
+                self.due_amount = (self.total or ZERO) - self.paid_amount
+            if update_fields is not None:
+                # The derived columns have to be written along with their inputs
+                kwargs['update_fields'] = update_fields = {
+                    *update_fields, "paid_amount", "due_amount",
+                }
+
+        touches_points = update_fields is None or not self.POINTS_FIELDS.isdisjoint(update_fields)
+        previous = None
+        if not self._state.adding and touches_points:
+            previous = getattr(self, '_points_applied', None)
+            if previous is None:
+                previous = (
+                    Sale.objects.filter(pk=self.pk)
+                    .values_list('customer_id', 'earned_points', 'redeemed_points')
+                    .first()
+                )
 
         super().save(*args, **kwargs)
+        if not touches_points:
+            return
+        # Mirror the generated column locally instead of re-reading the row
+        self.earned_points = int((self.total or 0) // POINT_VALUE)
+
+        # Earned points are added and redeemed ones taken off once, when the
+        # sale is created; edits undo what was applied before and re-apply.
+        # Movements go to PointsLedger. Earned points reach Customer.points
+        # on rollup, so checkout never waits on a popular customer's row
+        # lock; a sale that redeems (or used to redeem) points applies its
+        # customers' rows now, so the balance can't be spent twice.
+        applied = (self.customer_id, self.earned_points, self.redeemed_points)
+        if applied != previous:
+            entries = []
+            if previous and previous[0]:
+                entries.append(PointsLedger(
+                    shop_id=self.shop_id, customer_id=previous[0], sale=self,
+                    delta=previous[2] - previous[1],
+                ))
+            if self.customer_id:
+                entries.append(PointsLedger(
+                    shop_id=self.shop_id, customer_id=self.customer_id, sale=self,
+                    delta=self.earned_points - self.redeemed_points,
+                ))
+            PointsLedger.objects.bulk_create(entries)
+            redeems = self.redeemed_points or (previous and previous[2])
+            if redeems and entries:
+                PointsLedger.apply_pending(customer_ids={e.customer_id for e in entries})
+            if self.customer_id and Sale.customer.is_cached(self):
+                # Keep an already loaded customer in step for the response
+                customer = self.customer
+                if redeems:
+                    customer.refresh_from_db(fields=["points"])
+                elif previous is None:
+                    customer.points += self.earned_points
+        self._points_applied = applied
 
     def __str__(self):
-        return f"Sale #{self.id} [{self.shop.shop_id if self.shop else 'No Shop'}]"
+        return f"Sale #{self.id} [{self.shop.shop_id}]"
 
-class SaleItem(models.Model):
+class SaleItem(CachedStrMixin, models.Model):
     sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey(Product, on_delete=models.PROTECT)
     product_variant = models.ForeignKey(ProductVariant, on_delete=models.SET_NULL, null=True, blank=True)
@@ -357,10 +610,85 @@ class SaleItem(models.Model):
     vat_percent = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
     vat_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
 
-    def __str__(self):
+    def _build_str(self):
         return f"{self.product.title} × {self.quantity}"
 
 
+# ============================================================
+# CUSTOMER POINTS LEDGER
+# ============================================================
+class PointsLedger(models.Model):
+    """
+    Append-only customer points movements written by Sale.save.
+    apply_pending() folds unapplied rows into Customer.points. Sales that
+    redeem points apply their customer's rows at once; everything else is
+    applied by `manage.py apply_points_ledger`, run every few minutes by
+    points-ledger.timer.
+    """
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="points_ledger")
+    sale = models.ForeignKey(Sale, on_delete=models.SET_NULL, null=True, blank=True)
+    delta = models.IntegerField()
+    applied = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applied', 'customer'], name='pl_pending'),
+        ]
+
+    @classmethod
+    def apply_pending(cls, batch_size=500, customer_ids=None):
+        """
+        Add each customer's unapplied deltas to Customer.points in one
+        UPDATE per batch and mark the rows applied, for every customer or
+        only those in customer_ids. Returns
+        (rows, customers). For a negative total, GREATEST(points, -total) + total
+        floors at 0 without going negative on the unsigned column.
+        """
+        with transaction.atomic():
+            # Lock the rows and sum exactly those: a locking read sees rows
+            # committed after the transaction's snapshot, so re-selecting
+            # them by a pk bound could mark deltas applied that were never
+            # added
+            pending_rows = cls.objects.filter(applied=False)
+            if customer_ids is not None:
+                pending_rows = pending_rows.filter(customer_id__in=customer_ids)
+            locked = list(
+                pending_rows.select_for_update()
+                .values_list('pk', 'shop_id', 'customer_id', 'delta')
+            )
+            if not locked:
+                return 0, 0
+            pending = defaultdict(int)
+            for _, _, customer_id, delta in locked:
+                pending[customer_id] += delta
+            totals = list(pending.items())
+            for start in range(0, len(totals), batch_size):
+                batch = totals[start:start + batch_size]
+                whens = []
+                for customer_id, total in batch:
+                    if total >= 0:
+                        points = F('points') + total
+                    else:
+                        points = Greatest(F('points'), -total) - (-total)
+                    whens.append(When(pk=customer_id, then=points))
+                Customer.objects.filter(pk__in=[customer_id for customer_id, _ in batch]).update(
+                    points=Case(*whens, default=F('points'), output_field=models.PositiveIntegerField()),
+                    updated_at=timezone.now(),
+                )
+            # Sale lists embed the customer's points
+            for shop_id in {shop_id for _, shop_id, _, _ in locked}:
+                invalidate_list_cache(shop_id, 'sale')
+            pks = [pk for pk, _, _, _ in locked]
+            for start in range(0, len(pks), batch_size):
+                cls.objects.filter(pk__in=pks[start:start + batch_size]).update(applied=True)
+        return len(locked), len(totals)
+
+    def __str__(self):
+        return f"{self.customer_id} {self.delta:+d} (sale {self.sale_id})"
+
+
 # ============================================================
 # EXPENSE
 # ============================================================
@@ -372,7 +700,7 @@ class Expense(models.Model):
         ("other", "Other"),
     ]
 
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
 
     date = models.DateField(auto_now_add=True)
     category = models.CharField(max_length=100)
@@ -390,16 +718,51 @@ class Expense(models.Model):
 
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(
+                fields=['shop', '-date', 'amount', 'category'],
+                name='expense_shop_date_covering',
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.category} - {self.amount} [{self.shop.shop_id if self.shop else 'No Shop'}]"
+        return f"{self.category} - {self.amount} [{self.shop.shop_id}]"
 
 
 # ============================================================
 # SUPPLIER
 # ============================================================
+class SupplierManager(models.Manager):
+    def with_totals(self):
+        """
+        Annotate total_purchases, total_paid and total_due for
+        SupplierSerializer. Each sum is its own correlated subquery; joining
+        both tables and summing would multiply the rows.
+        """
+        money = models.DecimalField(max_digits=14, decimal_places=2)
+
+        def total(model, field):
+            rows = (
+                model.objects.filter(supplier=OuterRef('pk'))
+                .order_by()
+                .values('supplier')
+                .annotate(s=models.Sum(field))
+                .values('s')
+            )
+            return Coalesce(Subquery(rows, output_field=money), Value(ZERO), output_field=money)
+
+        return self.get_queryset().annotate(
+            total_purchases=total(Purchase, 'total'),
+            total_paid=total(SupplierPayment, 'amount'),
+        ).annotate(
+            total_due=models.ExpressionWrapper(
+                F('total_purchases') - F('total_paid'), output_field=money
+            ),
+        )
+
+
 class Supplier(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     name = models.CharField(max_length=200)
     phone = models.CharField(max_length=20, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
@@ -407,18 +770,20 @@ class Supplier(models.Model):
     opening_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SupplierManager()
+
     class Meta:
         unique_together = ("shop", "name")
         ordering = ["name"]
 
     def __str__(self):
-        return f"{self.name} [{self.shop.shop_id if self.shop else 'No Shop'}]"
+        return f"{self.name} [{self.shop.shop_id}]"
 
 
 # ============================================================
 # PURCHASE
 # ============================================================
-class Purchase(models.Model):
+class Purchase(CachedStrMixin, models.Model):
     PAYMENT_METHODS = [
         ("cash", "Cash"),
         ("bank", "Bank"),
@@ -426,7 +791,7 @@ class Purchase(models.Model):
         ("due", "Due"),
     ]
 
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
 
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT)
     invoice_no = models.CharField(max_length=50)
@@ -441,25 +806,108 @@ class Purchase(models.Model):
 
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHODS, default="cash")
     remarks = models.TextField(blank=True, null=True)
+    # Label for admin/browsable lists, stored so they don't load the supplier
+    display_title = models.CharField(max_length=255, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("shop", "invoice_no")
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(
+                fields=['shop', '-date', 'total', 'supplier'],
+                name='purchase_shop_date_covering',
+            ),
+            models.Index(fields=['shop', 'due_amount', 'date'], name='purchase_due_open'),
+        ]
 
     def save(self, *args, **kwargs):
-        self.due_amount = Decimal(self.total) - Decimal(self.paid_amount)
+        self.due_amount = (self.total or ZERO) - (self.paid_amount or ZERO)
+        if kwargs.get('update_fields') is None:
+            self.display_title = self._display_title()
         super().save(*args, **kwargs)
 
-    def __str__(self):
-        return f"{self.invoice_no} | {self.supplier.name} [{self.shop.shop_id if self.shop else 'No Shop'}]"
+    def _display_title(self):
+        return f"{self.invoice_no} | {self.supplier.name} [{self.shop.shop_id}]"
+
+    @classmethod
+    def create_with_items(cls, purchase_data, item_rows):
+        """
+        Create a purchase and its items in one transaction. The purchase's
+        subtotal/total are worked out from the items before it is inserted.
+        Items are bulk-inserted and stock is added per product/variant (see
+        PurchaseItem.bulk_create_with_stock); batch-tracked items get their
+        StockLedger entries in one more bulk insert.
+
+        Returns (purchase, items) with the items' pks set.
+        """
+        items = [PurchaseItem(**row) for row in item_rows]
+        for item in items:
+            item.calculate_totals()
+        subtotal = sum((item.total for item in items), ZERO)
+        purchase_data = dict(
+            purchase_data,
+            subtotal=subtotal,
+            total=subtotal - (purchase_data.get('discount') or ZERO),
+        )
+
+        with transaction.atomic():
+            purchase = cls.objects.create(**purchase_data)
+            for item in items:
+                item.purchase = purchase
+            PurchaseItem.bulk_create_with_stock(items)
+            if items and items[0].pk is None:
+                # Backends without RETURNING (MySQL) leave pks unset; the
+                # purchase is new, so its item pks in order belong to these rows
+                pks = purchase.items.order_by('pk').values_list('pk', flat=True)
+                for item, pk in zip(items, pks):
+                    item.pk = pk
+            purchase.post_stock_ledger(items)
+        return purchase, items
+
+    def post_stock_ledger(self, items):
+        """Record batch-tracked items in the StockLedger with one bulk insert"""
+        entries = []
+        for item in items:
+            if not item.batch_no or not (item.product_variant_id or item.product_id):
+                continue
+            entry = StockLedger(
+                shop_id=self.shop_id,
+                product=item.product,
+                product_variant=item.product_variant,
+                transaction_type='purchase',
+                batch_no=item.batch_no,
+                expiry_date=item.expiry_date,
+                quantity=item.total_base_qty,
+                remaining_qty=item.total_base_qty,
+                purchase_item=item,
+            )
+            # bulk_create skips save(), which normally fills the label
+            entry.display_title = entry._display_title()
+            entries.append(entry)
+        StockLedger.objects.bulk_create(entries, batch_size=500)
+
+    def _build_str(self):
+        return self.display_title or self._display_title()
 
 
 # ============================================================
 # PURCHASE ITEM
 # ============================================================
-class PurchaseItem(models.Model):
+def increment_stock(model, deltas):
+    """Add {pk: quantity} to the stock column of `model` in one UPDATE"""
+    if not deltas:
+        return
+    model.objects.filter(pk__in=deltas).update(
+        stock=F('stock') + Case(
+            *[When(pk=pk, then=Value(qty)) for pk, qty in deltas.items()],
+            output_field=models.DecimalField(max_digits=12, decimal_places=3),
+        )
+    )
+
+
+class PurchaseItem(CachedStrMixin, models.Model):
     PACK_UNIT_CHOICES = [
         ('bag', 'Bag'),
         ('carton', 'Carton'),
@@ -491,26 +939,106 @@ class PurchaseItem(models.Model):
     cost_per_base_unit = models.DecimalField(max_digits=12, decimal_places=4, default=0)  # price_per_pack / pack_size
     total = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # price_per_pack * qty_packs
 
+    def calculate_totals(self):
+        """Fill the auto-calculated fields from the pack size/qty/price"""
+        # The fields are already Decimals; only the division needs a
+        # bounded context
+        self.total_base_qty = self.pack_size * self.qty_packs
+        if self.pack_size > 0:
+            with localcontext() as ctx:
+                ctx.prec = 16
+                self.cost_per_base_unit = self.price_per_pack / self.pack_size
+        else:
+            self.cost_per_base_unit = ZERO
+        self.total = self.price_per_pack * self.qty_packs
+
+    # Columns that decide which stock row this item adds to, and how much
+    STOCK_FIELDS = frozenset({
+        "product", "product_id", "product_variant", "product_variant_id",
+        "pack_size", "qty_packs", "total_base_qty",
+    })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this item has added to stock, so a later save only
+        # moves the difference
+        if {"product_id", "product_variant_id", "total_base_qty"}.issubset(field_names):
+            instance._stock_applied = instance._stock_key()
+        return instance
+
+    def _stock_key(self):
+        return (self.product_id, self.product_variant_id, self.total_base_qty)
+
+    @staticmethod
+    def _add_stock(product_deltas, variant_deltas, product_id, variant_id, qty):
+        if variant_id:
+            variant_deltas[variant_id] += qty
+        elif product_id:
+            product_deltas[product_id] += qty
+
     def save(self, *args, **kwargs):
-        from django.db import transaction
-        
         # Calculate totals
-        self.total_base_qty = Decimal(self.pack_size) * Decimal(self.qty_packs)
-        self.cost_per_base_unit = Decimal(self.price_per_pack) / Decimal(self.pack_size) if self.pack_size > 0 else 0
-        self.total = Decimal(self.price_per_pack) * Decimal(self.qty_packs)
-        
+        self.calculate_totals()
+
+        update_fields = kwargs.get('update_fields')
+        touches_stock = update_fields is None or not self.STOCK_FIELDS.isdisjoint(update_fields)
+        previous = None
+        if not self._state.adding and touches_stock:
+            previous = getattr(self, '_stock_applied', None)
+            if previous is None:
+                previous = (
+                    PurchaseItem.objects.filter(pk=self.pk)
+                    .values_list('product_id', 'product_variant_id', 'total_base_qty')
+                    .first()
+                )
+
         with transaction.atomic():
             super().save(*args, **kwargs)
-            
-            # Update stock (either product or variant)
-            if self.product_variant:
-                self.product_variant.stock = Decimal(self.product_variant.stock) + self.total_base_qty
-                self.product_variant.save(update_fields=['stock'])
-            elif self.product:
-                self.product.stock = Decimal(self.product.stock) + self.total_base_qty
-                self.product.save(update_fields=['stock'])
+            if not touches_stock:
+                return
+
+            # Update stock (either product or variant) in SQL, without
+            # reading the current value first. Edits take back what the
+            # item added before and add the new quantity.
+            product_deltas = defaultdict(Decimal)
+            variant_deltas = defaultdict(Decimal)
+            if previous:
+                self._add_stock(product_deltas, variant_deltas, previous[0], previous[1], -previous[2])
+            self._add_stock(
+                product_deltas, variant_deltas,
+                self.product_id, self.product_variant_id, self.total_base_qty,
+            )
+            increment_stock(ProductVariant, {pk: q for pk, q in variant_deltas.items() if q})
+            increment_stock(Product, {pk: q for pk, q in product_deltas.items() if q})
+        self._stock_applied = self._stock_key()
 
-    def __str__(self):
+    @classmethod
+    def bulk_create_with_stock(cls, items, batch_size=1000):
+        """
+        Insert many unsaved purchase items at once and add their quantities
+        to product/variant stock with one UPDATE per model.
+
+        Like bulk_create, save() is not called for the items. On databases
+        that can't return ids from bulk inserts (MySQL) the items' pk stays
+        None afterwards.
+        """
+        product_deltas = defaultdict(Decimal)
+        variant_deltas = defaultdict(Decimal)
+        for item in items:
+            item.calculate_totals()
+            cls._add_stock(
+                product_deltas, variant_deltas,
+                item.product_id, item.product_variant_id, item.total_base_qty,
+            )
+
+        with transaction.atomic():
+            created = cls.objects.bulk_create(items, batch_size=batch_size)
+            increment_stock(ProductVariant, variant_deltas)
+            increment_stock(Product, product_deltas)
+        return created
+
+    def _build_str(self):
         if self.product_variant:
             return f"{self.product_variant} × {self.qty_packs} {self.pack_unit}s"
         return f"{self.product.title} × {self.qty_packs} {self.pack_unit}s"
@@ -519,8 +1047,8 @@ class PurchaseItem(models.Model):
 # ============================================================
 # SUPPLIER PAYMENT
 # ============================================================
-class SupplierPayment(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+class SupplierPayment(CachedStrMixin, models.Model):
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
 
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE)
     date = models.DateField(auto_now_add=True)
@@ -537,12 +1065,15 @@ class SupplierPayment(models.Model):
 
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(fields=['shop', '-date']),
+        ]
 
-    def __str__(self):
-        return f"{self.supplier.name} | {self.amount} [{self.shop.shop_id if self.shop else 'No Shop'}]"
+    def _build_str(self):
+        return f"{self.supplier.name} | {self.amount} [{self.shop.shop_id}]"
     
 class CustomerPayment(models.Model):
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="payments")
 
     date = models.DateField(auto_now_add=True)
@@ -558,12 +1089,36 @@ class CustomerPayment(models.Model):
 
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(fields=['shop', '-date']),
+        ]
     
 
 # ============================================================
 # STOCK LEDGER (Optional - for batch/expiry tracking and FIFO)
 # ============================================================
-class StockLedger(models.Model):
+class StockLedgerManager(models.Manager):
+    def available_batches(self, shop, product=None, product_variant=None):
+        """
+        FEFO pick list: one row per (batch_no, expiry_date) with stock left,
+        soonest expiry first, summing remaining_qty. Grouped in the database
+        off the sl_fefo_prod / sl_fefo_var indexes instead of walking every
+        ledger row in Python.
+        """
+        qs = self.get_queryset().filter(shop=shop, remaining_qty__gt=0)
+        if product_variant is not None:
+            qs = qs.filter(product_variant=product_variant)
+        else:
+            qs = qs.filter(product=product)
+        return (
+            qs.order_by()
+            .values('batch_no', 'expiry_date')
+            .annotate(qty=models.Sum('remaining_qty'))
+            .order_by(F('expiry_date').asc(nulls_last=True), 'batch_no')
+        )
+
+
+class StockLedger(CachedStrMixin, models.Model):
     """
     Track all stock movements with batch/expiry for pharmacy FIFO
     """
@@ -574,7 +1129,7 @@ class StockLedger(models.Model):
         ('return', 'Return'),
     ]
     
-    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, null=True, blank=True)
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.CASCADE, null=True, blank=True)
     product_variant = models.ForeignKey(ProductVariant, on_delete=models.CASCADE, null=True, blank=True)
     
@@ -596,6 +1151,10 @@ class StockLedger(models.Model):
     sale_item = models.ForeignKey(SaleItem, on_delete=models.SET_NULL, null=True, blank=True)
     
     notes = models.TextField(blank=True, null=True)
+    # Label for admin/browsable lists, stored so they don't load the product
+    display_title = models.CharField(max_length=255, blank=True, editable=False)
+
+    objects = StockLedgerManager()
     
     class Meta:
         ordering = ['expiry_date', 'transaction_date']  # FIFO by expiry date first
@@ -603,11 +1162,34 @@ class StockLedger(models.Model):
             models.Index(fields=['product', 'batch_no']),
             models.Index(fields=['product_variant', 'batch_no']),
             models.Index(fields=['expiry_date']),
+            # FEFO picking: a shop's batches of one product in expiry order,
+            # with remaining_qty read straight from the index
+            models.Index(
+                fields=['shop', 'product', 'expiry_date', 'remaining_qty'],
+                name='sl_fefo_prod',
+            ),
+            models.Index(
+                fields=['shop', 'product_variant', 'expiry_date', 'remaining_qty'],
+                name='sl_fefo_var',
+            ),
         ]
     
-    def __str__(self):
-        target = self.product or self.product_variant
-        return f"{target.title if target else 'Unknown'} | {self.transaction_type} | {self.quantity}"
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None:
+            self.display_title = self._display_title()
+        super().save(*args, **kwargs)
+
+    def _display_title(self):
+        if self.product_id:
+            target = self.product.title
+        elif self.product_variant_id:
+            target = str(self.product_variant)
+        else:
+            target = 'Unknown'
+        return f"{target} | {self.transaction_type} | {self.quantity}"
+
+    def _build_str(self):
+        return self.display_title or self._display_title()
 
 
 # ============================================================
@@ -647,6 +1229,10 @@ class CashTransaction(models.Model):
         ('cheque', 'Cheque'),
         ('other', 'Other'),
     ]
+
+    # Methods of synced sales/expenses/purchases/payments that are recorded
+    # as-is; anything else (due, mobile, ...) is booked as cash
+    SYNCED_PAYMENT_METHODS = frozenset({'cash', 'bank', 'bkash', 'nagad', 'card'})
     
     shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name='cash_transactions')
     
@@ -682,11 +1268,13 @@ class CashTransaction(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     class Meta:
         ordering = ['-date', '-created_at']
         indexes = [
-            models.Index(fields=['shop', 'date']),
+            # Matches the default ordering, so a shop's ledger is read in
+            # index order; also serves date-range filters
+            models.Index(fields=['shop', '-date', '-created_at'], name='ct_shop_recent'),
             models.Index(fields=['shop', 'source']),
             models.Index(fields=['shop', 'transaction_type']),
         ]
@@ -694,30 +1282,134 @@ class CashTransaction(models.Model):
     def __str__(self):
         return f"{self.date} | {self.get_transaction_type_display()} | {self.get_source_display()} | {self.amount}"
     
-    @classmethod
-    def get_current_balance(cls, shop):
-        """Get the current cash balance for a shop"""
-        from django.db.models import Sum, Case, When, F, DecimalField
-        
-        result = cls.objects.filter(shop=shop).aggregate(
-            total_credit=Sum(
-                Case(
-                    When(transaction_type='credit', then=F('amount')),
-                    default=0,
-                    output_field=DecimalField()
+    @staticmethod
+    def _signed(transaction_type, amount):
+        return amount if transaction_type == 'credit' else -amount
+
+    def _lock_balance(self):
+        """Lock (creating it on first use) the shop's ShopBalance row"""
+        balance, _ = ShopBalance.objects.select_for_update().get_or_create(
+            shop_id=self.shop_id
+        )
+        return balance
+
+    def save(self, *args, **kwargs):
+        """
+        Keep running_balance and ShopBalance current. Rows chain in insertion
+        (pk) order, so a new row is the shop balance plus its own amount;
+        editing a row shifts it and every later row by the difference.
+        """
+        with transaction.atomic():
+            # The locked ShopBalance row serializes ledger writes per shop
+            balance = self._lock_balance()
+            signed = self._signed(self.transaction_type, self.amount)
+            if self._state.adding:
+                self.running_balance = balance.balance + signed
+                super().save(*args, **kwargs)
+                delta = signed
+            else:
+                old = (
+                    CashTransaction.objects.filter(pk=self.pk)
+                    .values_list('transaction_type', 'amount')
+                    .first()
                 )
-            ),
-            total_debit=Sum(
-                Case(
-                    When(transaction_type='debit', then=F('amount')),
-                    default=0,
-                    output_field=DecimalField()
+                super().save(*args, **kwargs)
+                delta = signed - self._signed(*old) if old else ZERO
+                if delta:
+                    CashTransaction.objects.filter(
+                        shop_id=self.shop_id, pk__gte=self.pk
+                    ).update(running_balance=F('running_balance') + delta)
+                    self.running_balance += delta
+            if delta:
+                ShopBalance.objects.filter(pk=balance.pk).update(
+                    balance=F('balance') + delta, updated_at=timezone.now()
                 )
+                self._invalidate_balance()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            balance = self._lock_balance()
+            signed = self._signed(self.transaction_type, self.amount)
+            shop_id, pk = self.shop_id, self.pk
+            result = super().delete(*args, **kwargs)
+            CashTransaction.objects.filter(shop_id=shop_id, pk__gt=pk).update(
+                running_balance=F('running_balance') - signed
             )
+            ShopBalance.objects.filter(pk=balance.pk).update(
+                balance=F('balance') - signed, updated_at=timezone.now()
+            )
+            self._invalidate_balance(shop_id)
+        return result
+
+    @classmethod
+    def bulk_create_with_balance(cls, rows, batch_size=500):
+        """
+        Insert many unsaved transactions at once, in list order.
+
+        New rows always chain after their shop's current balance, so
+        running_balance is filled in here from one locked ShopBalance read
+        per shop rather than by save(), which (like bulk_create) is not
+        called for the rows.
+        """
+        by_shop = defaultdict(list)
+        for row in rows:
+            by_shop[row.shop_id].append(row)
+
+        with transaction.atomic():
+            # Lock in a fixed order so concurrent bulk inserts can't deadlock
+            for shop_id in sorted(by_shop):
+                shop_rows = by_shop[shop_id]
+                running = shop_rows[0]._lock_balance().balance
+                for row in shop_rows:
+                    running += cls._signed(row.transaction_type, row.amount)
+                    row.running_balance = running
+                ShopBalance.objects.filter(pk=shop_id).update(
+                    balance=running, updated_at=timezone.now()
+                )
+                shop_rows[0]._invalidate_balance()
+                invalidate_list_cache(shop_id, 'cash')
+            return cls.objects.bulk_create(rows, batch_size=batch_size)
+
+    @staticmethod
+    def _balance_cache_key(shop_id):
+        return f"cash-balance:{shop_id}"
+
+    def _invalidate_balance(self, shop_id=None):
+        """Drop the cached balance once the surrounding transaction commits"""
+        key = self._balance_cache_key(shop_id or self.shop_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    @classmethod
+    def get_current_balance(cls, shop):
+        """Get the current cash balance for a shop (cached when CASH_BALANCE_CACHE_TTL is set)"""
+        ttl = settings.CASH_BALANCE_CACHE_TTL
+        key = cls._balance_cache_key(shop.pk)
+        if ttl:
+            balance = cache.get(key)
+            if balance is not None:
+                return balance
+        balance = (
+            ShopBalance.objects.filter(shop=shop)
+            .values_list('balance', flat=True)
+            .first()
         )
-        
-        credit = result['total_credit'] or Decimal('0.00')
-        debit = result['total_debit'] or Decimal('0.00')
-        return credit - debit
+        if balance is None:
+            balance = ZERO
+        if ttl:
+            cache.set(key, balance, ttl)
+        return balance
+
 
-        return f"{self.transaction_type} - {target} - {self.quantity}"
+class ShopBalance(models.Model):
+    """
+    Current cash balance per shop, kept in step by CashTransaction.save/delete.
+    Its row doubles as the per-shop lock for ledger writes.
+    """
+    shop = models.OneToOneField(
+        Shop, on_delete=models.CASCADE, primary_key=True, related_name='cash_balance'
+    )
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.shop_id} | {self.balance}"
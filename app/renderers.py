@@ -0,0 +1,30 @@
+# app/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with orjson's C encoder. Types orjson doesn't know
+    (Decimal, lazy strings, timedelta, querysets, ...) go through DRF's own
+    JSONEncoder.default, so responses render the same as before.
+    """
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = OPTIONS
+        # orjson only indents by 2; good enough for the browsable API
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=self._default, option=options)
+        # Same escaping as JSONRenderer: keep the output a strict JS subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
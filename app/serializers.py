@@ -1,12 +1,18 @@
 # app/serializers.py
+from operator import attrgetter
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
 from .models import (
     Category, Customer, Product, ProductVariant, Sale, SaleItem, Expense,
-    Supplier, SupplierPayment, PurchaseItem, Purchase, StockLedger,
-    Shop, UserProfile, PaymentRequest, CustomerPayment, CashTransaction
+    Supplier, SupplierPayment, PurchaseItem, Purchase,
+    Shop, UserProfile, PaymentRequest, CustomerPayment, CashTransaction, ZERO,
 )
-from django.db.models import Sum
+from .backends import get_request_shop
+from django.db import models, transaction
+from django.db.models import F, Prefetch
 from decimal import Decimal
 
 User = get_user_model()
@@ -19,34 +25,200 @@ def get_current_shop(context):
     """Get the shop from the request user's profile"""
     request = context.get('request')
     if request and request.user.is_authenticated:
-        profile = getattr(request.user, 'profile', None)
-        if profile:
-            return profile.shop
+        return get_request_shop(request)
     return None
 
 
+_read_columns_cache = {}
+
+
+def absolute_media_url(request, url):
+    """
+    request.build_absolute_uri(url) for the root-relative URLs storages
+    return, with the scheme/host prefix worked out once per request
+    """
+    if not url.startswith("/") or url.startswith("//"):
+        return request.build_absolute_uri(url)
+    try:
+        base = request._media_url_base
+    except AttributeError:
+        base = request._media_url_base = request.build_absolute_uri("/")[:-1]
+    return base + url
+
+
+class MediaImageField(serializers.ImageField):
+    """ImageField rendering absolute URLs through absolute_media_url"""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        if not value or request is None or not getattr(self, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return super().to_representation(value)
+        return absolute_media_url(request, value.url)
+
+
+class BaseModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer for this app: absolute media URLs, plus the eager
+    loading and only() column hooks the viewsets use.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: MediaImageField,
+    }
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Add the select/prefetch_related this serializer's nested fields need"""
+        return queryset
+
+    @classmethod
+    def read_columns(cls):
+        """
+        only() paths for the model columns this serializer renders: its own
+        by name, related ones through their foreign key ("product.title"
+        becomes "product__title", which needs select_related). Sources
+        that aren't columns (method fields, model methods) are left out.
+        """
+        columns = _read_columns_cache.get(cls)
+        if columns is None:
+            columns = ["pk"]
+            for field in cls().fields.values():
+                if field.write_only or field.source == "*":
+                    continue
+                model = cls.Meta.model
+                for attr in field.source_attrs:
+                    try:
+                        model_field = model._meta.get_field(attr)
+                    except FieldDoesNotExist:
+                        break
+                    if not model_field.concrete:
+                        break
+                    model = model_field.related_model
+                else:
+                    columns.append("__".join(field.source_attrs))
+            _read_columns_cache[cls] = columns
+        return columns
+
+
+class CachedMethodField(serializers.SerializerMethodField):
+    """
+    SerializerMethodField that resolves its get_<field> method once when
+    bound, instead of looking it up on the parent for every row.
+    """
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self._method = getattr(type(parent), self.method_name)
+
+    def to_representation(self, value):
+        return self._method(self.parent, value)
+
+
+class ShopScopedCreateMixin:
+    """Create rows in the request user's shop"""
+
+    def create(self, validated_data):
+        shop = get_current_shop(self.context)
+        if not shop:
+            raise serializers.ValidationError({"shop": "Shop not found."})
+        validated_data["shop"] = shop
+        return super().create(validated_data)
+
+
+class FlatRepresentationMixin:
+    """
+    Faster to_representation for rows serialized in bulk (list endpoints,
+    sale and purchase items). Fields backed by a model column are read
+    straight off the instance (foreign keys as their raw id), and so are
+    read-only fields on a column of a foreign key ("category.name"),
+    instead of going through Field.get_attribute; anything else takes
+    the usual DRF path.
+    """
+
+    def _related_getter(self, field, columns):
+        """Getter for a read-only "fk.column" source, or None"""
+        if not field.read_only or field.default is not serializers.empty or len(field.source_attrs) != 2:
+            return None
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+            return None
+        fk_name, attr = field.source_attrs
+        fk = columns.get(fk_name)
+        if fk is None or not fk.many_to_one:
+            return None
+        try:
+            if not fk.related_model._meta.get_field(attr).concrete:
+                return None
+        except FieldDoesNotExist:
+            return None
+        fk_attname = fk.attname
+        allow_null = field.allow_null
+
+        def get(instance):
+            # Without a relation DRF renders None for allow_null fields
+            # and leaves the key out for the rest
+            if getattr(instance, fk_attname) is None:
+                if allow_null:
+                    return None
+                raise serializers.SkipField()
+            return getattr(getattr(instance, fk_name), attr)
+        return get
+
+    def _representation_plan(self):
+        plan = getattr(self, '_plan', None)
+        if plan is None:
+            columns = {
+                f.name: f for f in self.Meta.model._meta.concrete_fields
+            }
+            plan = []
+            for field in self._readable_fields:
+                column = columns.get(field.source)
+                if column is None:
+                    get = self._related_getter(field, columns)
+                    if get is None:
+                        plan.append((field.field_name, None, field))
+                    else:
+                        plan.append((field.field_name, get, field.to_representation))
+                elif isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                    plan.append((field.field_name, attrgetter(column.attname), None))
+                else:
+                    plan.append((field.field_name, attrgetter(column.attname), field.to_representation))
+            self._plan = plan
+        return plan
+
+    def to_representation(self, instance):
+        ret = {}
+        for name, get, convert in self._representation_plan():
+            if get is None:
+                try:
+                    value = convert.get_attribute(instance)
+                except serializers.SkipField:
+                    continue
+                ret[name] = None if value is None else convert.to_representation(value)
+                continue
+            try:
+                value = get(instance)
+            except serializers.SkipField:
+                continue
+            ret[name] = value if value is None or convert is None else convert(value)
+        return ret
+
+
 # ------------------------------------------------------------
 # CATEGORY SERIALIZER
 # ------------------------------------------------------------
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ShopScopedCreateMixin, BaseModelSerializer):
     class Meta:
         model = Category
         fields = ["id", "name"]
         read_only_fields = ['shop']
 
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data['shop'] = shop
-        return super().create(validated_data)
-
 
 # ------------------------------------------------------------
 # PRODUCT SERIALIZER
 # ------------------------------------------------------------
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(FlatRepresentationMixin, ShopScopedCreateMixin, BaseModelSerializer):
     category_name = serializers.CharField(source="category.name", read_only=True)
-    image_url = serializers.SerializerMethodField(read_only=True)
+    image_url = CachedMethodField(read_only=True)
 
     class Meta:
         model = Product
@@ -61,124 +233,26 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ("created_at", "updated_at", "shop")
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        # image is deferred by ProductManager but rendered here
+        return queryset.defer(None).select_related("category")
+
     def get_image_url(self, obj):
         request = self.context.get("request")
-        if obj.image and hasattr(obj.image, "url"):
+        # FieldFile is falsy without a name; hasattr(.., "url") would build the URL twice
+        if obj.image:
             url = obj.image.url
             if request:
-                return request.build_absolute_uri(url)
+                return absolute_media_url(request, url)
             return url
         return None
 
 
-# ------------------------------------------------------------
-# CASH TRANSACTION / LEDGER SERIALIZER
-# ------------------------------------------------------------
-class CashTransactionSerializer(serializers.ModelSerializer):
-    source_display = serializers.CharField(source='get_source_display', read_only=True)
-    transaction_type_display = serializers.CharField(source='get_transaction_type_display', read_only=True)
-    payment_method_display = serializers.CharField(source='get_payment_method_display', read_only=True)
-    created_by_name = serializers.SerializerMethodField()
-    reference_details = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = CashTransaction
-        fields = [
-            'id', 'date', 'transaction_type', 'transaction_type_display',
-            'source', 'source_display', 'amount', 'running_balance',
-            'payment_method', 'payment_method_display',
-            'description', 'reference_no', 'bank_name',
-            'is_manual', 'created_by', 'created_by_name',
-            'sale', 'expense', 'purchase', 'supplier_payment', 'customer_payment',
-            'reference_details', 'created_at', 'updated_at'
-        ]
-        read_only_fields = ['id', 'running_balance', 'created_by', 'created_at', 'updated_at']
-    
-    def get_created_by_name(self, obj):
-        if obj.created_by:
-            return obj.created_by.username
-        return None
-    
-    def get_reference_details(self, obj):
-        """Get details from the referenced object (sale, expense, purchase, etc.)"""
-        if obj.sale:
-            return {
-                'type': 'sale',
-                'id': obj.sale.id,
-                'customer': obj.sale.customer.name if obj.sale.customer else 'Walk-in',
-                'total': float(obj.sale.total)
-            }
-        elif obj.expense:
-            return {
-                'type': 'expense',
-                'id': obj.expense.id,
-                'category': obj.expense.category,
-                'description': obj.expense.description
-            }
-        elif obj.purchase:
-            return {
-                'type': 'purchase',
-                'id': obj.purchase.id,
-                'supplier': obj.purchase.supplier.name,
-                'invoice_no': obj.purchase.invoice_no
-            }
-        elif obj.supplier_payment:
-            return {
-                'type': 'supplier_payment',
-                'id': obj.supplier_payment.id,
-                'supplier': obj.supplier_payment.supplier.name
-            }
-        elif obj.customer_payment:
-            return {
-                'type': 'customer_payment',
-                'id': obj.customer_payment.id,
-                'customer': obj.customer_payment.customer.name
-            }
-        return None
-    
-    def create(self, validated_data):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            validated_data['created_by'] = request.user
-            profile = getattr(request.user, 'profile', None)
-            if profile:
-                validated_data['shop'] = profile.shop
-        validated_data['is_manual'] = True
-        return super().create(validated_data)
-
-
-class CashTransactionCreateSerializer(serializers.ModelSerializer):
-    """Simplified serializer for creating manual transactions"""
-    
-    class Meta:
-        model = CashTransaction
-        fields = [
-            'date', 'transaction_type', 'source', 'amount',
-            'payment_method', 'description', 'reference_no', 'bank_name'
-        ]
-    
-    def create(self, validated_data):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            validated_data['created_by'] = request.user
-            profile = getattr(request.user, 'profile', None)
-            if profile:
-                validated_data['shop'] = profile.shop
-        validated_data['is_manual'] = True
-        return super().create(validated_data)
-
-
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data['shop'] = shop
-        return super().create(validated_data)
-
-
 # ------------------------------------------------------------
 # PRODUCT VARIANT SERIALIZER
 # ------------------------------------------------------------
-class ProductVariantSerializer(serializers.ModelSerializer):
+class ProductVariantSerializer(BaseModelSerializer):
     product_title = serializers.CharField(source="product.title", read_only=True)
     product_base_unit = serializers.CharField(source="product.base_unit", read_only=True)
 
@@ -196,7 +270,7 @@ class ProductVariantSerializer(serializers.ModelSerializer):
 # ------------------------------------------------------------
 # CUSTOMER SERIALIZER
 # ------------------------------------------------------------
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(FlatRepresentationMixin, ShopScopedCreateMixin, BaseModelSerializer):
     sales_count = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -207,17 +281,11 @@ class CustomerSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at", "sales_count", "shop"]
 
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data['shop'] = shop
-        return super().create(validated_data)
-
 
 # ------------------------------------------------------------
 # SALE ITEM SERIALIZER
 # ------------------------------------------------------------
-class SaleItemSerializer(serializers.ModelSerializer):
+class SaleItemSerializer(FlatRepresentationMixin, BaseModelSerializer):
     class Meta:
         model = SaleItem
         fields = ["id", "product", "product_variant", "quantity", "unit", "price", "total", 
@@ -227,7 +295,7 @@ class SaleItemSerializer(serializers.ModelSerializer):
 # ------------------------------------------------------------
 # CUSTOMER WRITE SERIALIZER FOR SALE CREATION
 # ------------------------------------------------------------
-class SaleCustomerWriteSerializer(serializers.ModelSerializer):
+class SaleCustomerWriteSerializer(BaseModelSerializer):
     class Meta:
         model = Customer
         fields = ["name", "phone"]
@@ -236,15 +304,30 @@ class SaleCustomerWriteSerializer(serializers.ModelSerializer):
         }
 
 
+class SaleCustomerReadSerializer(FlatRepresentationMixin, BaseModelSerializer):
+    """The customer as embedded in sale responses"""
+
+    class Meta:
+        model = Customer
+        fields = ["id", "name", "phone", "points"]
+
+
+class SalePaymentWriteSerializer(serializers.Serializer):
+    """The `payment` object of a sale: parsed and validated, amounts as Decimal"""
+    method = serializers.CharField(required=False, allow_blank=True, default="cash")
+    paid_amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, allow_null=True)
+    trx_id = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
 # ------------------------------------------------------------
 # SALE SERIALIZER
 # ------------------------------------------------------------
-class SaleSerializer(serializers.ModelSerializer):
-    customer = CustomerSerializer(read_only=True)
+class SaleSerializer(BaseModelSerializer):
+    customer = SaleCustomerReadSerializer(read_only=True)
     customer_data = SaleCustomerWriteSerializer(write_only=True, required=False, allow_null=True)
     items = SaleItemSerializer(many=True)
     earned_points = serializers.ReadOnlyField()
-    payment = serializers.JSONField(write_only=True, required=False)
+    payment = SalePaymentWriteSerializer(write_only=True, required=False, allow_null=True)
     redeemed_points = serializers.IntegerField(min_value=0, default=0, write_only=True)
 
     class Meta:
@@ -271,25 +354,56 @@ class SaleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["shop", "due_amount", "earned_points", "date"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related("customer").prefetch_related("items")
+
+    def validate(self, attrs):
+        """
+        Check the payment against the total before SaleViewSet.create
+        touches the database, and resolve its defaults for create().
+        """
+        if self.instance is not None:
+            return attrs
+        payment = attrs.get("payment") or {}
+        method = (payment.get("method") or "cash").strip()
+        paid_amount = payment.get("paid_amount") or ZERO
+        total = attrs.get("total") or ZERO
+
+        if paid_amount > total:
+            raise serializers.ValidationError({"paid_amount": "Paid amount cannot be greater than total."})
+
+        # IMPORTANT: Only require customer if payment method is 'due'
+        if method == "due":
+            # SaleViewSet.create and create() find or add the customer by phone
+            if not (attrs.get("customer_data") or {}).get("phone"):
+                raise serializers.ValidationError({"customer_data": "Customer is required for due payments."})
+        elif paid_amount == 0:
+            # For non-due payments, set paid_amount = total if not specified
+            paid_amount = total
+
+        attrs["payment"] = {
+            "method": method,
+            "paid_amount": paid_amount,
+            "trx_id": payment.get("trx_id") or "",
+        }
+        return attrs
+
+    # SaleViewSet.create already runs in a transaction; don't add a savepoint
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
-        request = self.context.get('request')
-        shop = None
-        if request and hasattr(request.user, 'profile'):
-            profile = request.user.profile
-            if hasattr(profile, 'shop'):
-                shop = profile.shop
-        
+        shop = get_current_shop(self.context)
         if not shop:
             raise serializers.ValidationError({"shop": "Shop not found."})
 
         # Remove all data that will be handled separately
-        payment_data = validated_data.pop("payment", {}) or {}
+        payment_data = validated_data.pop("payment")  # Resolved by validate()
         customer_payload = validated_data.pop("customer_data", {}) or {}
         items_data = validated_data.pop("items", [])
         redeemed_points = validated_data.pop("redeemed_points", 0)
         
         # Remove fields that will be set explicitly
-        validated_data.pop("customer", None)  # Remove if exists
+        customer = validated_data.pop("customer", None)  # Resolved by the view
         validated_data.pop("shop", None)  # Remove if exists
         validated_data.pop("payment_method", None)
         validated_data.pop("paid_amount", None)
@@ -300,77 +414,34 @@ class SaleSerializer(serializers.ModelSerializer):
         phone = customer_payload.get("phone")
         name = customer_payload.get("name")
 
-        customer = None
-        if phone:
-            customer, created = Customer.objects.get_or_create(
-                shop=shop,
-                phone=phone,
-                defaults={"name": name or phone},
-            )
-            if not created and name and customer.name != name:
-                customer.name = name
-                customer.save()
-
-        # ---- payment parse ----
-        method = (payment_data.get("method") or "cash").strip()
-        paid_amount = Decimal(str(payment_data.get("paid_amount") or 0))
-        trx_id = payment_data.get("trx_id") or ""
-        
-        total = Decimal(str(validated_data.get("total") or 0))
-        
-        # Validate payment
-        if paid_amount > total:
-            raise serializers.ValidationError({"paid_amount": "Paid amount cannot be greater than total."})
-
-        # IMPORTANT: Only require customer if payment method is 'due'
-        if method == "due":
-            if not customer:
-                raise serializers.ValidationError({"customer_data": "Customer is required for due payments."})
-        else:
-            # For non-due payments, set paid_amount = total if not specified
-            if paid_amount == 0:
-                paid_amount = total
+        if customer is None and phone:
+            customer = Customer.get_for_sale(shop, phone, name)
 
         # Create the sale with cleaned validated_data
         sale = Sale.objects.create(
             shop=shop,  # Explicitly set shop
             customer=customer,  # Explicitly set customer
-            payment_method=method,
-            paid_amount=paid_amount,
-            trx_id=trx_id,
+            payment_method=payment_data["method"],
+            paid_amount=payment_data["paid_amount"],
+            trx_id=payment_data["trx_id"],
             redeemed_points=redeemed_points,
             **validated_data,  # Only remaining fields
         )
         
-        # Calculate due_amount
-        if method == "due":
-            sale.due_amount = total - paid_amount
-        else:
-            sale.due_amount = Decimal("0.00")
-        
-        sale.save(update_fields=["due_amount"])
-
-        # Update customer points if customer exists
-        if customer and total > 0:
-            # Calculate earned points (1 point per 100 Tk)
-            earned_points = int(total / 100)
-            
-            # Update customer points: current + earned - redeemed
-            customer.points = customer.points + earned_points - redeemed_points
-            if customer.points < 0:
-                customer.points = 0
-            customer.save(update_fields=["points"])
+        # due_amount and customer points are set by Sale.save
 
-        # Create sale items
-        for item in items_data:
-            SaleItem.objects.create(sale=sale, **item)
+        # Create sale items in multi-row INSERTs
+        SaleItem.objects.bulk_create(
+            [SaleItem(sale=sale, **item) for item in items_data],
+            batch_size=500,
+        )
 
         return sale
 
 # ------------------------------------------------------------
 # Customer Payment Serializer
 # ------------------------------------------------------------
-class CustomerPaymentSerializer(serializers.ModelSerializer):
+class CustomerPaymentSerializer(ShopScopedCreateMixin, BaseModelSerializer):
     customer_name = serializers.CharField(source="customer.name", read_only=True)
 
     class Meta:
@@ -378,18 +449,12 @@ class CustomerPaymentSerializer(serializers.ModelSerializer):
         fields = ["id", "customer", "customer_name", "date", "memo_no", "amount", "payment_method", "remarks"]
         read_only_fields = ["shop", "date"]
 
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data["shop"] = shop
-        return super().create(validated_data)
-
 
 # ------------------------------------------------------------
 # EXPENSE SERIALIZER
 # ------------------------------------------------------------
-class ExpenseSerializer(serializers.ModelSerializer):
-    added_by_name = serializers.SerializerMethodField()
+class ExpenseSerializer(ShopScopedCreateMixin, BaseModelSerializer):
+    added_by_name = serializers.CharField(source='added_by.username', read_only=True, default=None)
 
     class Meta:
         model = Expense
@@ -399,16 +464,9 @@ class ExpenseSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "date", "added_by", "added_by_name", "shop"]
 
-    def get_added_by_name(self, obj):
-        return getattr(obj.added_by, "username", None)
-
     def create(self, validated_data):
         request = self.context.get("request")
-        shop = get_current_shop(self.context)
-        
-        if shop:
-            validated_data['shop'] = shop
-        if request.user.is_authenticated:
+        if request and request.user.is_authenticated:
             validated_data["added_by"] = request.user
         return super().create(validated_data)
 
@@ -416,7 +474,7 @@ class ExpenseSerializer(serializers.ModelSerializer):
 # ------------------------------------------------------------
 # PURCHASE / SUPPLIER SERIALIZERS
 # ------------------------------------------------------------
-class PurchaseItemSerializer(serializers.ModelSerializer):
+class PurchaseItemSerializer(FlatRepresentationMixin, BaseModelSerializer):
     product_title = serializers.CharField(source="product.title", read_only=True, allow_null=True)
     variant_name = serializers.CharField(source="product_variant.variant_name", read_only=True, allow_null=True)
     
@@ -431,7 +489,7 @@ class PurchaseItemSerializer(serializers.ModelSerializer):
         read_only_fields = ["total_base_qty", "cost_per_base_unit", "total"]
 
 
-class PurchaseSerializer(serializers.ModelSerializer):
+class PurchaseSerializer(BaseModelSerializer):
     supplier_name = serializers.CharField(source="supplier.name", read_only=True)
     items = PurchaseItemSerializer(many=True)
 
@@ -445,54 +503,41 @@ class PurchaseSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['shop', 'subtotal', 'total', 'due_amount']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related("supplier").prefetch_related(
+            Prefetch(
+                "items",
+                queryset=PurchaseItem.objects.select_related("product", "product_variant"),
+            )
+        )
+
     def create(self, validated_data):
-        from django.db import transaction
-        
         shop = get_current_shop(self.context)
         if not shop:
             raise serializers.ValidationError({"shop": "Shop not found."})
             
         items_data = validated_data.pop("items", [])
-        discount = Decimal(validated_data.get("discount", 0))
-        
-        with transaction.atomic():
-            # Create purchase
-            purchase = Purchase.objects.create(shop=shop, **validated_data)
-
-            # Create purchase items and calculate totals
-            subtotal = Decimal('0')
-            for item_data in items_data:
-                # Create purchase item (save method handles stock update and calculations)
-                item = PurchaseItem.objects.create(purchase=purchase, **item_data)
-                subtotal += item.total
-                
-                # Create stock ledger entry for batch tracking
-                product = item.product_variant or item.product
-                if product and item.batch_no:
-                    StockLedger.objects.create(
-                        shop=shop,
-                        product=item.product,
-                        product_variant=item.product_variant,
-                        transaction_type='purchase',
-                        batch_no=item.batch_no,
-                        expiry_date=item.expiry_date,
-                        quantity=item.total_base_qty,
-                        remaining_qty=item.total_base_qty,
-                        purchase_item=item,
-                    )
-
-            # Update purchase totals
-            purchase.subtotal = subtotal
-            purchase.total = subtotal - discount
-            purchase.save(update_fields=['subtotal', 'total', 'due_amount'])
 
+        # Create purchase (totals included), items and stock ledger entries
+        # (bulk-inserted, stock is updated per product)
+        purchase, _ = Purchase.create_with_items(
+            dict(shop=shop, **validated_data), items_data
+        )
         return purchase
 
 
-class SupplierSerializer(serializers.ModelSerializer):
-    total_purchases = serializers.SerializerMethodField()
-    total_paid = serializers.SerializerMethodField()
-    total_due = serializers.SerializerMethodField()
+class SupplierSerializer(ShopScopedCreateMixin, BaseModelSerializer):
+    # Annotated by Supplier.objects.with_totals(); a new supplier has none yet
+    total_purchases = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True, default=Decimal("0.00"), coerce_to_string=False
+    )
+    total_paid = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True, default=Decimal("0.00"), coerce_to_string=False
+    )
+    total_due = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True, default=Decimal("0.00"), coerce_to_string=False
+    )
 
     class Meta:
         model = Supplier
@@ -502,25 +547,8 @@ class SupplierSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['shop']
 
-    def get_total_purchases(self, obj):
-        total = Purchase.objects.filter(supplier=obj).aggregate(sum_val=Sum("total"))["sum_val"]
-        return total or Decimal("0.00")
-
-    def get_total_paid(self, obj):
-        total = SupplierPayment.objects.filter(supplier=obj).aggregate(sum_val=Sum("amount"))["sum_val"]
-        return total or Decimal("0.00")
-
-    def get_total_due(self, obj):
-        return self.get_total_purchases(obj) - self.get_total_paid(obj)
 
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data['shop'] = shop
-        return super().create(validated_data)
-
-
-class SupplierPaymentSerializer(serializers.ModelSerializer):
+class SupplierPaymentSerializer(ShopScopedCreateMixin, BaseModelSerializer):
     supplier_name = serializers.CharField(source="supplier.name", read_only=True)
 
     class Meta:
@@ -528,12 +556,6 @@ class SupplierPaymentSerializer(serializers.ModelSerializer):
         fields = ["id", "supplier", "supplier_name", "date", "memo_no", "amount", "payment_method", "remarks"]
         read_only_fields = ['shop']
 
-    def create(self, validated_data):
-        shop = get_current_shop(self.context)
-        if shop:
-            validated_data['shop'] = shop
-        return super().create(validated_data)
-
 
 # ------------------------------------------------------------
 # SUBSCRIPTION SYSTEM SERIALIZERS
@@ -561,7 +583,7 @@ class ShopRegistrationSerializer(serializers.Serializer):
         return value
 
 
-class PaymentRequestSerializer(serializers.ModelSerializer):
+class PaymentRequestSerializer(BaseModelSerializer):
     class Meta:
         model = PaymentRequest
         fields = ["method", "sender_last4", "amount", "transaction_id", "screenshot"]
@@ -576,13 +598,13 @@ class SubscriptionStatusSerializer(serializers.Serializer):
     expire_date = serializers.DateField(allow_null=True)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(BaseModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email"]
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(BaseModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     phone = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
@@ -614,7 +636,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             user = instance.user
             user.username = user_data.get("username", user.username)
             user.email = user_data.get("email", user.email)
-            user.save()
+            user.save(update_fields=["username", "email"])
 
         return super().update(instance, validated_data)
 
@@ -634,8 +656,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
             print(f"Error in to_representation: {str(e)}")
             raise
     
-class ShopSerializer(serializers.ModelSerializer):
-    logo_url = serializers.SerializerMethodField()
+class ShopSerializer(BaseModelSerializer):
+    logo_url = CachedMethodField()
     
     class Meta:
         model = Shop
@@ -644,21 +666,23 @@ class ShopSerializer(serializers.ModelSerializer):
     
     def get_logo_url(self, obj):
         request = self.context.get('request')
-        if obj.logo and hasattr(obj.logo, 'url'):
+        if obj.logo:
             url = obj.logo.url
-    
+            if request:
+                return absolute_media_url(request, url)
+            return url
         return None
 
 
 # ------------------------------------------------------------
 # CASH TRANSACTION / LEDGER SERIALIZER
 # ------------------------------------------------------------
-class CashTransactionSerializer(serializers.ModelSerializer):
+class CashTransactionSerializer(BaseModelSerializer):
     source_display = serializers.CharField(source='get_source_display', read_only=True)
     transaction_type_display = serializers.CharField(source='get_transaction_type_display', read_only=True)
     payment_method_display = serializers.CharField(source='get_payment_method_display', read_only=True)
-    created_by_name = serializers.SerializerMethodField()
-    reference_details = serializers.SerializerMethodField()
+    created_by_name = serializers.CharField(source='created_by.username', read_only=True, default=None)
+    reference_details = CachedMethodField()
     
     class Meta:
         model = CashTransaction
@@ -673,11 +697,6 @@ class CashTransactionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'running_balance', 'created_by', 'created_at', 'updated_at']
     
-    def get_created_by_name(self, obj):
-        if obj.created_by:
-            return obj.created_by.username
-        return None
-    
     def get_reference_details(self, obj):
         """Get details from the referenced object (sale, expense, purchase, etc.)"""
         if obj.sale:
@@ -719,14 +738,116 @@ class CashTransactionSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             validated_data['created_by'] = request.user
-            profile = getattr(request.user, 'profile', None)
-            if profile:
-                validated_data['shop'] = profile.shop
+            shop = get_request_shop(request)
+            if shop:
+                validated_data['shop'] = shop
         validated_data['is_manual'] = True
         return super().create(validated_data)
 
 
-class CashTransactionCreateSerializer(serializers.ModelSerializer):
+def cash_transactions_serialize_list(queryset):
+    """
+    Same output as CashTransactionSerializer(queryset, many=True).data, built
+    from one .values() query (references joined in SQL) instead of model
+    instances and per-field get_attribute calls. Used by the ledger list.
+    """
+    fields = CashTransactionSerializer().fields
+    fmt = {
+        name: fields[name].to_representation
+        for name in ('date', 'amount', 'running_balance', 'created_at', 'updated_at')
+    }
+    labels = {
+        name: dict(CashTransaction._meta.get_field(name).flatchoices)
+        for name in ('transaction_type', 'source', 'payment_method')
+    }
+    rows = queryset.values(
+        'id', 'date', 'transaction_type', 'source', 'amount', 'running_balance',
+        'payment_method', 'description', 'reference_no', 'bank_name', 'is_manual',
+        'created_by', 'sale', 'expense', 'purchase', 'supplier_payment', 'customer_payment',
+        'created_at', 'updated_at',
+        created_by_name=F('created_by__username'),
+        sale_customer=F('sale__customer__name'),
+        sale_total=F('sale__total'),
+        expense_category=F('expense__category'),
+        expense_description=F('expense__description'),
+        purchase_supplier=F('purchase__supplier__name'),
+        purchase_invoice_no=F('purchase__invoice_no'),
+        supplier_payment_supplier=F('supplier_payment__supplier__name'),
+        customer_payment_customer=F('customer_payment__customer__name'),
+    )
+
+    def value(row, name):
+        v = row[name]
+        return None if v is None else fmt[name](v)
+
+    def reference_details(row):
+        if row['sale']:
+            return {
+                'type': 'sale',
+                'id': row['sale'],
+                'customer': row['sale_customer'] or 'Walk-in',
+                'total': float(row['sale_total'])
+            }
+        elif row['expense']:
+            return {
+                'type': 'expense',
+                'id': row['expense'],
+                'category': row['expense_category'],
+                'description': row['expense_description']
+            }
+        elif row['purchase']:
+            return {
+                'type': 'purchase',
+                'id': row['purchase'],
+                'supplier': row['purchase_supplier'],
+                'invoice_no': row['purchase_invoice_no']
+            }
+        elif row['supplier_payment']:
+            return {
+                'type': 'supplier_payment',
+                'id': row['supplier_payment'],
+                'supplier': row['supplier_payment_supplier']
+            }
+        elif row['customer_payment']:
+            return {
+                'type': 'customer_payment',
+                'id': row['customer_payment'],
+                'customer': row['customer_payment_customer']
+            }
+        return None
+
+    return [
+        {
+            'id': row['id'],
+            'date': value(row, 'date'),
+            'transaction_type': row['transaction_type'],
+            'transaction_type_display': labels['transaction_type'].get(row['transaction_type'], row['transaction_type']),
+            'source': row['source'],
+            'source_display': labels['source'].get(row['source'], row['source']),
+            'amount': value(row, 'amount'),
+            'running_balance': value(row, 'running_balance'),
+            'payment_method': row['payment_method'],
+            'payment_method_display': labels['payment_method'].get(row['payment_method'], row['payment_method']),
+            'description': row['description'],
+            'reference_no': row['reference_no'],
+            'bank_name': row['bank_name'],
+            'is_manual': row['is_manual'],
+            'created_by': row['created_by'],
+            'created_by_name': row['created_by_name'],
+            'sale': row['sale'],
+            'expense': row['expense'],
+            'purchase': row['purchase'],
+            'supplier_payment': row['supplier_payment'],
+            'customer_payment': row['customer_payment'],
+            'reference_details': reference_details(row),
+            'created_at': value(row, 'created_at'),
+            'updated_at': value(row, 'updated_at'),
+        }
+        for row in rows
+    ]
+
+
+class CashTransactionCreateSerializer(BaseModelSerializer):
     """Simplified serializer for creating manual transactions"""
     
     class Meta:
@@ -740,8 +861,8 @@ class CashTransactionCreateSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             validated_data['created_by'] = request.user
-            profile = getattr(request.user, 'profile', None)
-            if profile:
-                validated_data['shop'] = profile.shop
+            shop = get_request_shop(request)
+            if shop:
+                validated_data['shop'] = shop
         validated_data['is_manual'] = True
         return super().create(validated_data)
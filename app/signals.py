@@ -0,0 +1,42 @@
+# app/signals.py
+"""
+Invalidate the cached sale / cash transaction lists (see
+SaleViewSet.list and CashTransactionListAPIView) when anything they
+render changes.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    CashTransaction, Customer, CustomerPayment, Expense, Purchase, Sale, SaleItem,
+    Supplier, SupplierPayment, invalidate_list_cache,
+)
+
+# Models whose rows (or names) show up in each list
+SALE_LIST_SENDERS = (Sale, Customer)
+CASH_LIST_SENDERS = (
+    CashTransaction, Sale, Customer, Expense, Purchase, Supplier,
+    SupplierPayment, CustomerPayment,
+)
+
+
+@receiver([post_save, post_delete])
+def invalidate_shop_lists(sender, instance, **kwargs):
+    kinds = []
+    if sender in SALE_LIST_SENDERS:
+        kinds.append('sale')
+    if sender in CASH_LIST_SENDERS:
+        kinds.append('cash')
+    if kinds:
+        invalidate_list_cache(instance.shop_id, *kinds)
+
+
+@receiver([post_save, post_delete], sender=SaleItem)
+def invalidate_sale_list_for_item(sender, instance, **kwargs):
+    if not settings.LIST_CACHE_TTL:
+        return
+    invalidate_list_cache(
+        Sale.objects.filter(pk=instance.sale_id).values_list('shop_id', flat=True).first(),
+        'sale',
+    )
@@ -0,0 +1,290 @@
+# app/tests.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .serializers import FlatRepresentationMixin
+from .models import (
+    CashTransaction, Category, Customer, PointsLedger, Product, ProductVariant,
+    Purchase, Sale, Shop, StockLedger, Supplier, UserProfile,
+)
+
+
+def make_shop(**kwargs):
+    fields = dict(
+        shop_name="Test Shop", phone="01700000000", owner_name="Owner",
+        plan="monthly", is_active=True, expire_date=date.today() + timedelta(days=30),
+    )
+    fields.update(kwargs)
+    return Shop.objects.create(**fields)
+
+
+class ShopAPITestCase(APITestCase):
+    """An active shop whose owner is logged in with a JWT"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = make_shop()
+        cls.user = User.objects.create_user("owner", password="secret")
+        UserProfile.objects.create(user=cls.user, shop=cls.shop, is_owner=True)
+        cls.category = Category.objects.create(shop=cls.shop, name="General")
+        cls.product = Product.objects.create(
+            shop=cls.shop, category=cls.category, title="Rice",
+            product_code="R1", regular_price=Decimal("100"), stock=50,
+        )
+
+    def setUp(self):
+        # Resolved tokens and users are cached across requests
+        cache.clear()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+class TokenAuthenticationTests(ShopAPITestCase):
+    """SubscriptionMiddleware and DRF share one token check and user lookup"""
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [q for q in queries.captured_queries if '"auth_user"' in q["sql"]]
+
+    def test_user_is_loaded_once_per_token(self):
+        self.assertEqual(len(self.user_queries("/api/categories/")), 1)
+        self.assertEqual(self.user_queries("/api/categories/"), [])
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.client.get("/api/categories/").status_code, 401)
+
+
+class CreateInShopTests(ShopAPITestCase):
+    """Rows created over the API belong to the request user's shop"""
+
+    def test_create_product(self):
+        response = self.client.post("/api/products/", {
+            "title": "Lentils", "product_code": "L1",
+            "category": self.category.id, "regular_price": "80",
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        product = Product.objects.get(pk=response.data["id"])
+        self.assertEqual(product.shop, self.shop)
+        self.assertEqual(product.selling_price, Decimal("80.00"))
+
+    def test_create_sale(self):
+        response = self.client.post("/api/sales/", {
+            "customer_data": {"name": "Rahim", "phone": "01800000000"},
+            "items": [{"product": self.product.id, "quantity": 2, "price": "100", "total": "200"}],
+            "subtotal": "200", "total": "200",
+            "payment": {"method": "due", "paid_amount": "50"},
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        sale = Sale.objects.get(pk=response.data["data"]["id"])
+        self.assertEqual(sale.shop, self.shop)
+        self.assertEqual(sale.customer.shop, self.shop)
+        self.assertEqual(sale.due_amount, Decimal("150.00"))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, Decimal("48"))
+
+    def test_create_purchase(self):
+        supplier = Supplier.objects.create(shop=self.shop, name="Wholesaler")
+        response = self.client.post("/api/purchases/", {
+            "supplier": supplier.id, "invoice_no": "P-1", "date": str(date.today()),
+            "paid_amount": "10", "payment_method": "cash",
+            "items": [{"product": self.product.id, "qty_packs": "3", "price_per_pack": "20"}],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        purchase = Purchase.objects.get(invoice_no="P-1")
+        self.assertEqual(purchase.shop, self.shop)
+        self.assertEqual(purchase.total, Decimal("60.00"))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, Decimal("53"))
+
+    def test_create_cash_transaction(self):
+        for kind, amount in (("credit", "100"), ("debit", "30")):
+            response = self.client.post("/api/cash-transactions/create/", {
+                "date": str(date.today()), "transaction_type": kind,
+                "source": "other", "amount": amount,
+            }, format="json")
+            self.assertEqual(response.status_code, 201, response.content)
+        rows = CashTransaction.objects.filter(shop=self.shop).order_by("pk")
+        self.assertEqual([t.running_balance for t in rows], [Decimal("100"), Decimal("70")])
+        self.assertEqual(CashTransaction.get_current_balance(self.shop), Decimal("70"))
+
+
+class ShopOwnedAdminTests(TestCase):
+    def test_shop_admin_adds_row_without_picking_a_shop(self):
+        shop = make_shop()
+        staff = User.objects.create_user("staff", password="secret", is_staff=True)
+        staff.user_permissions.add(Permission.objects.get(codename="add_category"))
+        UserProfile.objects.create(user=staff, shop=shop)
+        self.client.force_login(staff)
+
+        response = self.client.post("/admin-mnlz/app/category/add/", {"name": "Snacks"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Category.objects.get(name="Snacks").shop, shop)
+
+
+class PointsLedgerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = make_shop()
+        cls.customer = Customer.objects.create(shop=cls.shop, name="Rahim", phone="01800000000", points=5)
+
+    def sell(self, total, **kwargs):
+        return Sale.objects.create(shop=self.shop, customer=self.customer, total=Decimal(total), **kwargs)
+
+    def test_apply_pending_adds_deltas_once(self):
+        self.sell("250")
+        self.sell("120")
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 5)
+
+        self.assertEqual(PointsLedger.apply_pending(), (2, 1))
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 8)
+        self.assertFalse(PointsLedger.objects.filter(applied=False).exists())
+
+        self.assertEqual(PointsLedger.apply_pending(), (0, 0))
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 8)
+
+    def test_sale_edit_moves_points_between_customers(self):
+        other = Customer.objects.create(shop=self.shop, name="Karim", phone="01900000000")
+        sale = self.sell("300")
+        sale.customer = other
+        sale.save()
+
+        PointsLedger.apply_pending()
+        self.customer.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.customer.points, other.points), (5, 3))
+
+    def test_redemption_applies_the_customer_at_once(self):
+        self.sell("250")
+        sale = self.sell("50", redeemed_points=4)
+
+        self.assertEqual(sale.customer.points, 3)
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 3)
+        self.assertFalse(PointsLedger.objects.filter(applied=False).exists())
+
+        # Dropping the redemption gives the points back straight away
+        sale.redeemed_points = 0
+        sale.save()
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 7)
+
+    def test_negative_total_floors_at_zero(self):
+        PointsLedger.objects.create(shop=self.shop, customer=self.customer, delta=-9)
+        PointsLedger.apply_pending()
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.points, 0)
+
+
+class LoginTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = make_shop()
+        cls.user = User.objects.create_user("01711111111", email="owner@example.com", password="secret")
+        UserProfile.objects.create(user=cls.user, shop=cls.shop, is_owner=True)
+
+    def login(self, username):
+        return self.client.post("/api/auth/login/", {"username": username, "password": "secret"}, format="json")
+
+    def test_login_by_username_or_email(self):
+        for username in ("01711111111", "owner@example.com"):
+            response = self.login(username)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertIn("access", response.data)
+
+    def test_inactive_shop_gets_402_for_both_logins(self):
+        Shop.objects.filter(pk=self.shop.pk).update(is_active=False)
+        for username in ("01711111111", "owner@example.com"):
+            response = self.login(username)
+            self.assertEqual(response.status_code, 402, response.content)
+            self.assertEqual(response.data["error_code"], "SUBSCRIPTION_INACTIVE")
+
+    def test_wrong_password(self):
+        response = self.client.post("/api/auth/login/", {"username": "owner@example.com", "password": "nope"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class AvailableBatchesTests(TestCase):
+    """StockLedger.objects.available_batches: the FEFO pick list"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.shop = make_shop()
+        category = Category.objects.create(shop=cls.shop, name="Medicine")
+        cls.product = Product.objects.create(
+            shop=cls.shop, category=category, title="Paracetamol",
+            product_code="P1", regular_price=Decimal("10"),
+        )
+        cls.variant = ProductVariant.objects.create(product=cls.product, variant_name="500mg")
+        soon, later = date.today() + timedelta(days=30), date.today() + timedelta(days=90)
+        for batch_no, expiry_date, remaining in (
+            ("B2", later, "4"),
+            ("B3", None, "7"),
+            ("B1", soon, "5"),
+            ("B1", soon, "3"),  # a second purchase of the same batch
+            ("B0", soon, "0"),  # used up
+        ):
+            cls.add(product=cls.product, batch_no=batch_no, expiry_date=expiry_date, remaining=remaining)
+        cls.add(product_variant=cls.variant, batch_no="V1", expiry_date=later, remaining="2")
+
+    @classmethod
+    def add(cls, remaining, **kwargs):
+        StockLedger.objects.create(
+            shop=cls.shop, transaction_type="purchase",
+            quantity=Decimal("10"), remaining_qty=Decimal(remaining), **kwargs,
+        )
+
+    def test_product_batches_grouped_soonest_expiry_first(self):
+        rows = StockLedger.objects.available_batches(self.shop, product=self.product)
+        self.assertEqual(
+            [(r["batch_no"], r["expiry_date"], r["qty"]) for r in rows],
+            [
+                ("B1", date.today() + timedelta(days=30), Decimal("8")),
+                ("B2", date.today() + timedelta(days=90), Decimal("4")),
+                ("B3", None, Decimal("7")),
+            ],
+        )
+
+    def test_variant_batches(self):
+        rows = StockLedger.objects.available_batches(self.shop, product_variant=self.variant)
+        self.assertEqual([(r["batch_no"], r["qty"]) for r in rows], [("V1", Decimal("2"))])
+
+
+class FlatRepresentationTests(TestCase):
+    """FlatRepresentationMixin renders rows exactly as DRF would"""
+
+    class SaleRowSerializer(serializers.ModelSerializer):
+        customer_name = serializers.CharField(source="customer.name", read_only=True)
+        customer_phone = serializers.CharField(source="customer.phone", read_only=True, allow_null=True)
+
+        class Meta:
+            model = Sale
+            fields = ["id", "customer", "customer_name", "customer_phone", "total", "date"]
+
+    class FlatSaleRowSerializer(FlatRepresentationMixin, SaleRowSerializer):
+        pass
+
+    def test_matches_drf_with_and_without_relation(self):
+        shop = make_shop()
+        customer = Customer.objects.create(shop=shop, name="Rahim", phone="01800000000")
+        sales = [
+            Sale.objects.create(shop=shop, customer=customer, total=Decimal("120")),
+            Sale.objects.create(shop=shop, total=Decimal("80")),
+        ]
+        expected = self.SaleRowSerializer(sales, many=True).data
+        self.assertEqual(self.FlatSaleRowSerializer(sales, many=True).data, expected)
+        self.assertNotIn("customer_name", expected[1])
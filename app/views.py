@@ -3,12 +3,14 @@ from decimal import Decimal
 import io
 from datetime import date, timedelta, timezone
 from datetime import datetime, date as _date, datetime as _datetime
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldError
 from openpyxl import Workbook
 
 
 from django.db import transaction
-from django.db.models import Q, Sum, Count, F, DecimalField, ExpressionWrapper, Value as V
+from django.db.models import Q, Sum, Count, F, DecimalField, ExpressionWrapper, Prefetch, Value as V
 from django.db.models.functions import TruncDate, Coalesce
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
@@ -31,16 +33,19 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet
 from rest_framework import status
 
+from .backends import get_request_shop
 from .models import (
     Product, ProductVariant, Category, Sale, Customer, SaleItem, Expense, Supplier, CustomerPayment,
-    Purchase, PurchaseItem, SupplierPayment, Shop, UserProfile, PaymentRequest, CashTransaction
+    Purchase, PurchaseItem, SupplierPayment, Shop, UserProfile, PaymentRequest, CashTransaction,
+    increment_stock, list_cache_key,
 )
 from .serializers import (
     ProductSerializer, ProductVariantSerializer, CategorySerializer, SaleSerializer,
     CustomerSerializer, ExpenseSerializer, SupplierSerializer, UserProfileSerializer,
     PurchaseSerializer, PurchaseItemSerializer, SupplierPaymentSerializer, CustomerPaymentSerializer,
     ShopRegistrationSerializer, PaymentRequestSerializer,
-    ShopSerializer, CashTransactionSerializer, CashTransactionCreateSerializer
+    ShopSerializer, CashTransactionSerializer, CashTransactionCreateSerializer,
+    cash_transactions_serialize_list,
 )
 
 User = get_user_model()
@@ -143,12 +148,34 @@ class ShopFilterMixin:
     def get_queryset(self):
         qs = super().get_queryset()
         if self.request.user.is_authenticated:
-            profile = getattr(self.request.user, 'profile', None)
-            if profile and profile.shop:
-                return qs.filter(shop=profile.shop)
+            shop = get_request_shop(self.request)
+            if shop:
+                return qs.filter(shop=shop)
         return qs.none()  # Return empty if no shop
 
 
+class NarrowColumnsMixin:
+    """
+    Mixin to load only the columns the serializer renders when listing,
+    so list queries (and their select_related joins) skip unused columns
+    """
+
+    def narrow_columns(self, qs):
+        if self.action == "list":
+            qs = qs.only(*self.get_serializer_class().read_columns())
+        return qs
+
+    def get_queryset(self):
+        return self.narrow_columns(super().get_queryset())
+
+
+class EagerLoadingMixin:
+    """Mixin to apply the serializer's setup_eager_loading to the queryset"""
+
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
+
 # -----------------------------
 # Category & Product
 # -----------------------------
@@ -161,15 +188,15 @@ class CategoryViewSet(ShopFilterMixin, viewsets.ModelViewSet):
     required_feature = "products"
 
 
-class ProductViewSet(ShopFilterMixin, viewsets.ModelViewSet):
-    queryset = Product.objects.select_related("category").order_by("-id")
+class ProductViewSet(NarrowColumnsMixin, EagerLoadingMixin, ShopFilterMixin, viewsets.ModelViewSet):
+    queryset = Product.objects.order_by("-id")
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     filter_backends = [filters.SearchFilter]
     search_fields = ["title", "product_code", "sku", "barcode"]
 
 
-class ProductVariantViewSet(ShopFilterMixin, viewsets.ModelViewSet):
+class ProductVariantViewSet(NarrowColumnsMixin, ShopFilterMixin, viewsets.ModelViewSet):
     """
     ViewSet for Product Variants
     Supports filtering by product_id via query param: ?product=<id>
@@ -183,9 +210,9 @@ class ProductVariantViewSet(ShopFilterMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         qs = ProductVariant.objects.select_related("product").order_by("-id")
         if self.request.user.is_authenticated:
-            profile = getattr(self.request.user, 'profile', None)
-            if profile and profile.shop:
-                qs = qs.filter(product__shop=profile.shop)
+            shop = get_request_shop(self.request)
+            if shop:
+                qs = qs.filter(product__shop=shop)
         else:
             qs = qs.none()
             
@@ -193,13 +220,13 @@ class ProductVariantViewSet(ShopFilterMixin, viewsets.ModelViewSet):
         product_id = self.request.query_params.get('product', None)
         if product_id:
             qs = qs.filter(product_id=product_id)
-        return qs
+        return self.narrow_columns(qs)
 
 
 # -----------------------------
 # Sales
 # -----------------------------
-class SaleViewSet(ShopFilterMixin, viewsets.ModelViewSet):
+class SaleViewSet(EagerLoadingMixin, ShopFilterMixin, viewsets.ModelViewSet):
     queryset = Sale.objects.all().order_by("-id")
     serializer_class = SaleSerializer
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
@@ -209,6 +236,20 @@ class SaleViewSet(ShopFilterMixin, viewsets.ModelViewSet):
     search_fields = ["customer__name", "customer__phone"]
     ordering_fields = ["date", "id", "total"]
 
+    def list(self, request, *args, **kwargs):
+        # The unfiltered list is what the POS screen keeps polling; cache it
+        # per shop (app/signals.py drops it when a sale or customer changes)
+        shop = get_request_shop(request)
+        shop_id = shop.pk if shop else None
+        if not settings.LIST_CACHE_TTL or request.query_params or not shop_id:
+            return super().list(request, *args, **kwargs)
+        key = list_cache_key("sale", shop_id)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, settings.LIST_CACHE_TTL)
+        return Response(data)
+
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -220,8 +261,7 @@ class SaleViewSet(ShopFilterMixin, viewsets.ModelViewSet):
             )
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Check if guest sale
         customer_data = request.data.get("customer_data")
@@ -234,14 +274,7 @@ class SaleViewSet(ShopFilterMixin, viewsets.ModelViewSet):
             name = customer_data.get("name", "").strip()
             
             if phone and name:
-                customer, created = Customer.objects.get_or_create(
-                    phone=phone,
-                    shop=shop,
-                    defaults={"name": name, "shop": shop}
-                )
-                if not created:
-                    customer.name = name
-                    customer.save(update_fields=["name"])
+                customer = Customer.get_for_sale(shop, phone, name)
         
         items = request.data.get("items", [])
         product_ids = [i.get("product") for i in items if i.get("product")]
@@ -279,21 +312,16 @@ class SaleViewSet(ShopFilterMixin, viewsets.ModelViewSet):
             redeemed_points=redeemed_points
         )
         
-        # Deduct stock
+        # Deduct stock in one UPDATE; the rows are already locked above
+        stock_deltas = {}
         for item in items:
-            p = products[item["product"]]
-            p.stock -= int(item["quantity"])
-            p.save(update_fields=["stock"])
-        
-        # Calculate points earned
-        total_points_earned = 0
-        if customer:
-            # Calculate earned points: 1 point per 100 Tk spent
-            total_points_earned = int(sale.total / 100)
-            
-            # Update customer points (add earned, subtract redeemed)
-            customer.points = customer.points + total_points_earned - redeemed_points
-            customer.save(update_fields=["points"])
+            pid = item["product"]
+            stock_deltas[pid] = stock_deltas.get(pid, 0) - int(item["quantity"])
+        increment_stock(Product, stock_deltas)
+        
+        # Sale.save recorded the points in PointsLedger (applied to the
+        # customer at once when points were redeemed)
+        total_points_earned = sale.earned_points if sale.customer_id else 0
 
         return Response(
             {
@@ -317,11 +345,10 @@ def product_lookup(request):
         return Response({"error": "No code provided"}, status=400)
 
     # Get current shop
-    profile = request.user.profile
-    shop = profile.shop if profile else None
+    shop = get_request_shop(request)
     
     try:
-        product = Product.objects.get(
+        product = ProductSerializer.setup_eager_loading(Product.objects).get(
             Q(product_code__iexact=code) | Q(barcode__iexact=code),
             shop=shop
         )
@@ -454,7 +481,7 @@ class CustomerViewSet(ShopFilterMixin, viewsets.ModelViewSet):
     @action(detail=True, methods=["post"])
     def repay(self, request, pk=None):
         customer = self.get_object()
-        shop = request.user.profile.shop
+        shop = get_request_shop(request)
 
         amount = Decimal(str(request.data.get("amount") or "0"))
         if amount <= 0:
@@ -487,8 +514,7 @@ def customer_lookup(request):
     if not phone:
         return Response({"error": "No phone provided"}, status=400)
     # Get current shop
-    profile = request.user.profile
-    shop = profile.shop if profile else None
+    shop = get_request_shop(request)
     
     try:
         customer = Customer.objects.get(phone=phone, shop=shop)
@@ -612,7 +638,7 @@ class CustomerLedgerDetailView(ShopFilterMixin, APIView):
 
     def get(self, request, customer_id):
         try:
-            customer = Customer.objects.get(id=customer_id, shop=request.user.profile.shop)
+            customer = Customer.objects.get(id=customer_id, shop=get_request_shop(request))
         except Customer.DoesNotExist:
             return Response({"error": "Customer not found"}, status=404)
 
@@ -629,8 +655,9 @@ class CustomerLedgerDetailView(ShopFilterMixin, APIView):
         ledger = []
         
  
+        # (row, signed amount) pairs; the running balance adds the Decimals
         for sale in sales:
-            ledger.append({
+            ledger.append(({
                 "id": sale.id,
                 "type": "বিক্রয়",
                 "date": sale.date.strftime("%Y-%m-%d"),
@@ -644,10 +671,10 @@ class CustomerLedgerDetailView(ShopFilterMixin, APIView):
                 "debit": float(sale.total),
                 "credit": 0.0,
                 "balance": None,
-            })
+            }, sale.total))
         
         for payment in payments:
-            ledger.append({
+            ledger.append(({
                 "id": payment.id,
                 "type": "Payment",
                 "date": payment.date.strftime("%Y-%m-%d"),
@@ -657,13 +684,14 @@ class CustomerLedgerDetailView(ShopFilterMixin, APIView):
                 "debit": 0.0,
                 "credit": float(payment.amount),
                 "balance": None,
-            })
+            }, -payment.amount))
         
-        ledger = sorted(ledger, key=lambda x: x["date"])
+        ledger.sort(key=lambda x: x[0]["date"])
         running = Decimal("0.00")
-        for row in ledger:
-            running += Decimal(str(row["debit"])) - Decimal(str(row["credit"]))
+        for row, amount in ledger:
+            running += amount
             row["balance"] = float(running)
+        ledger = [row for row, _ in ledger]
         
         return Response({
             "customer": {
@@ -690,31 +718,23 @@ class CustomerDueSummaryView(ShopFilterMixin, APIView):
         customers_with_due = []
         
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
-        customers = Customer.objects.filter(shop=shop).order_by("name")
+        customers = (
+            Customer.objects.with_totals()
+            .filter(shop=shop, total_due__gt=0)
+            .order_by("name")
+        )
         
         for customer in customers:
-            # Calculate customer's total due
-            sales = Sale.objects.filter(customer=customer)
-            payments = CustomerPayment.objects.filter(customer=customer)
-            
-            total_sales = sales.aggregate(total=Coalesce(Sum("total"), V(0)))["total"]
-            total_paid_from_sales = sales.aggregate(total=Coalesce(Sum("paid_amount"), V(0)))["total"]
-            total_paid_from_payments = payments.aggregate(total=Coalesce(Sum("amount"), V(0)))["total"]
-            total_paid = total_paid_from_sales + total_paid_from_payments
-            total_due = total_sales - total_paid
-            
-            if total_due > 0:
-                customers_with_due.append({
-                    "id": customer.id,
-                    "name": customer.name,
-                    "phone": customer.phone,
-                    "total_due": float(total_due),
-                    "last_sale_date": sales.last().date if sales.exists() else None,
-                    "points": customer.points,
-                })
+            customers_with_due.append({
+                "id": customer.id,
+                "name": customer.name,
+                "phone": customer.phone,
+                "total_due": float(customer.total_due),
+                "last_sale_date": customer.last_sale_date,
+                "points": customer.points,
+            })
         
         # Sort by highest due
         customers_with_due.sort(key=lambda x: x["total_due"], reverse=True)
@@ -740,8 +760,7 @@ class SalesMetricsView(ShopFilterMixin, APIView):
         start_of_month = today.replace(day=1)
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         today_total = (
             Sale.objects.filter(shop=shop, date__date=today).aggregate(total=Sum("total"))["total"]
@@ -794,8 +813,7 @@ class DailySalesView(ShopFilterMixin, APIView):
         end = request.GET.get("to")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         try:
             if not (start and end):
@@ -825,7 +843,7 @@ class CategorySummaryView(APIView):
         start = request.GET.get("from")
         end = request.GET.get("to")
 
-        shop = request.user.profile.shop
+        shop = get_request_shop(request)
 
         if not (start and end):
             return Response({"detail": "from and to are required (YYYY-MM-DD)."}, status=400)
@@ -862,7 +880,7 @@ class TopProductsView(APIView):
         end = request.GET.get("to")
         limit = int(request.GET.get("limit", 5))
 
-        shop = request.user.profile.shop
+        shop = get_request_shop(request)
 
         if not (start and end):
             return Response({"detail": "from and to are required (YYYY-MM-DD)."}, status=400)
@@ -899,8 +917,7 @@ class CategorySummaryView(ShopFilterMixin, APIView):
         end = request.GET.get("to")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         qs = (
             SaleItem.objects.filter(sale__shop=shop, sale__date__date__range=[start, end])
@@ -935,8 +952,7 @@ class TopProductsView(ShopFilterMixin, APIView):
         limit = int(request.GET.get("limit", 5))
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         qs = (
             SaleItem.objects.filter(sale__shop=shop, sale__date__date__range=[start, end])
@@ -966,8 +982,8 @@ class TopProductsView(ShopFilterMixin, APIView):
 # -----------------------------
 # Expenses
 # -----------------------------
-class ExpenseViewSet(ShopFilterMixin, viewsets.ModelViewSet):
-    queryset = Expense.objects.all().order_by("-date", "-id")
+class ExpenseViewSet(NarrowColumnsMixin, ShopFilterMixin, viewsets.ModelViewSet):
+    queryset = Expense.objects.select_related("added_by").order_by("-date", "-id")
     serializer_class = ExpenseSerializer
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     required_feature = "reports"
@@ -994,8 +1010,7 @@ class ExpenseSummaryView(ShopFilterMixin, APIView):
         t = request.GET.get("to")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Get filtered queryset
         qs = Expense.objects.filter(shop=shop)
@@ -1029,7 +1044,7 @@ class ExpenseSummaryView(ShopFilterMixin, APIView):
 # Supplier + Purchases
 # -----------------------------
 class SupplierViewSet(ShopFilterMixin, viewsets.ModelViewSet):
-    queryset = Supplier.objects.all().order_by("name")
+    queryset = Supplier.objects.with_totals().order_by("name")
     serializer_class = SupplierSerializer
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     required_feature = "purchases"
@@ -1052,9 +1067,11 @@ class SupplierViewSet(ShopFilterMixin, viewsets.ModelViewSet):
 
         entries = []
 
-        purchases = Purchase.objects.filter(supplier=supplier).order_by("date", "id")
+        purchases = Purchase.objects.filter(supplier=supplier).order_by("date", "id").prefetch_related(
+            Prefetch("items", queryset=PurchaseItem.objects.select_related("product", "product_variant"))
+        )
         for p in purchases:
-            items = PurchaseItem.objects.filter(purchase=p).select_related("product")
+            items = p.items.all()
             entries.append(
                 {
                     "id": p.id,
@@ -1121,7 +1138,7 @@ class SupplierViewSet(ShopFilterMixin, viewsets.ModelViewSet):
         )
 
 
-class PurchaseViewSet(ShopFilterMixin, viewsets.ModelViewSet):
+class PurchaseViewSet(EagerLoadingMixin, ShopFilterMixin, viewsets.ModelViewSet):
     queryset = Purchase.objects.all().order_by("-date", "-id")
     serializer_class = PurchaseSerializer
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
@@ -1197,8 +1214,10 @@ class SupplierLedgerView(ShopFilterMixin, APIView):
 
         ledger = []
 
-        for p in purchases:
-            items = PurchaseItem.objects.filter(purchase=p).select_related("product", "product_variant")
+        for p in purchases.prefetch_related(
+            Prefetch("items", queryset=PurchaseItem.objects.select_related("product", "product_variant"))
+        ):
+            items = p.items.all()
             item_list = [
                 {
                     "product": it.product.title if it.product else str(it.product_variant),
@@ -1267,8 +1286,7 @@ class SupplierLedgerView(ShopFilterMixin, APIView):
 def sales_report(request):
     """Sales report with shop filtering"""
     # Get current shop
-    profile = request.user.profile
-    shop = profile.shop if profile else None
+    shop = get_request_shop(request)
     
     start_date = request.GET.get("start_date")
     end_date = request.GET.get("end_date")
@@ -1589,8 +1607,7 @@ class BusinessOverviewAPIView(ShopFilterMixin, APIView):
         end_date = request.GET.get("end_date")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         sales_filter = {"shop": shop}
         expenses_filter = {"shop": shop}
@@ -1712,8 +1729,7 @@ class BusinessOverviewTimeseriesAPIView(ShopFilterMixin, APIView):
         end_date = request.GET.get("end_date")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         sales_filter = {"shop": shop}
         expenses_filter = {"shop": shop}
@@ -1780,8 +1796,7 @@ class BusinessOverviewExportPDF(ShopFilterMixin, APIView):
         end_date = request.GET.get("end_date")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Get summary data
         sales_filter = {"shop": shop}
@@ -1933,8 +1948,7 @@ class BusinessOverviewExportExcel(ShopFilterMixin, APIView):
         end_date = request.GET.get("end_date")
 
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Get summary data
         sales_filter = {"shop": shop}
@@ -2147,7 +2161,7 @@ class LoginView(APIView):
                     shop.activate_yearly()
                 else:
                     shop.is_active = True
-                    shop.save()
+                    shop.save(update_fields=["is_active"])
                 print(f"✓ Shop activated after payment verification: {shop.is_active}")
         
         # Check if trial expired
@@ -2405,9 +2419,7 @@ class AdminVerifyPaymentView(APIView):
 
         # Mark as verified
         pr.is_verified = True
-        pr.verified_at = timezone.now()
-        pr.verified_by = request.user
-        pr.save()
+        pr.save(update_fields=["is_verified"])
 
         # Calculate new expiry date with remaining days
         today = date.today()
@@ -2441,7 +2453,7 @@ class AdminVerifyPaymentView(APIView):
         shop.plan = plan if plan else shop.plan
         shop.expire_date = new_expire_date
         shop.is_active = True
-        shop.save()
+        shop.save(update_fields=["plan", "expire_date", "is_active"])
 
         # Send SMS notification (implement your SMS service)
         self.send_activation_notification(shop)
@@ -2534,7 +2546,7 @@ class SubscriptionStatusView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        shop = request.user.profile.shop
+        shop = get_request_shop(request)
         
         # Calculate subscription status
         today = date.today()
@@ -2590,7 +2602,7 @@ class RenewSubscriptionView(APIView):
 
     def post(self, request):
         try:
-            shop = request.user.profile.shop
+            shop = get_request_shop(request)
         except AttributeError:
             return Response({"detail": "User profile or shop not found."}, status=400)
         
@@ -2630,14 +2642,14 @@ class UpdateShopLogoView(APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
 
     def post(self, request):
-        shop = request.user.profile.shop
+        shop = get_request_shop(request)
 
         new_logo = request.FILES.get("logo")
         if not new_logo:
             return Response({"detail": "Logo file required."}, status=400)
 
         shop.logo = new_logo
-        shop.save()
+        shop.save(update_fields=["logo"])
 
         return Response({
             "detail": "Shop logo updated successfully.",
@@ -2656,7 +2668,7 @@ class UpdateProfilePictureView(APIView):
             return Response({"detail": "Profile picture required."}, status=400)
 
         profile.profile_picture = pp
-        profile.save()
+        profile.save(update_fields=["profile_picture"])
 
         return Response({
             "detail": "Profile picture updated.",
@@ -2683,7 +2695,7 @@ class ShopUserViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return only users from current user's shop"""
-        shop = self.request.user.profile.shop
+        shop = get_request_shop(self.request)
         return UserProfile.objects.filter(shop=shop).order_by('-id')
     
     def list(self, request, *args, **kwargs):
@@ -2820,12 +2832,12 @@ class ShopUserViewSet(viewsets.ModelViewSet):
             username = request.data.get("username")
             if username:  # Only update if not empty
                 instance.user.username = username
-                instance.user.save()
+                instance.user.save(update_fields=["username"])
         
         # Update is_active status
         if "is_active" in request.data:
             instance.user.is_active = request.data.get("is_active")
-            instance.user.save()
+            instance.user.save(update_fields=["is_active"])
 
         instance.save()
         
@@ -2953,7 +2965,7 @@ def update_user_password(request, user_id):
     
     # Update password
     target_profile.user.set_password(new_password)
-    target_profile.user.save()
+    target_profile.user.save(update_fields=["password"])
     
     return Response({
         "success": True,
@@ -3006,8 +3018,7 @@ class ComprehensiveDashboardMetricsView(ShopFilterMixin, APIView):
         start_of_month = today.replace(day=1)
         
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # 1. Sales KPIs
         today_total = (
@@ -3087,24 +3098,13 @@ class ComprehensiveDashboardMetricsView(ShopFilterMixin, APIView):
         
         # Calculate due amounts for all customers
         all_customers = Customer.objects.filter(shop=shop)
-        
-        for customer in all_customers:
-            # Get all sales for this customer
-            customer_sales = Sale.objects.filter(customer=customer, shop=shop)
-            if customer_sales.exists():
-                total_sales = customer_sales.aggregate(total=Sum("total"))["total"] or Decimal('0.00')
-                total_paid = customer_sales.aggregate(total=Sum("paid_amount"))["total"] or Decimal('0.00')
-                
-                # Add customer payments
-                customer_payments = CustomerPayment.objects.filter(customer=customer, shop=shop)
-                total_payments = customer_payments.aggregate(total=Sum("amount"))["total"] or Decimal('0.00')
-                
-                total_paid += total_payments
-                customer_due = total_sales - total_paid
-                
-                if customer_due > Decimal('0.00'):
-                    total_customer_due += customer_due
-                    customers_with_due += 1
+        due = (
+            Customer.objects.with_totals()
+            .filter(shop=shop, total_due__gt=0)
+            .aggregate(total=Sum("total_due"), count=Count("id"))
+        )
+        total_customer_due = due["total"] or Decimal('0.00')
+        customers_with_due = due["count"]
         
         # 4. Additional metrics
         total_customers = all_customers.count()
@@ -3170,8 +3170,7 @@ class StockAlertDashboardView(ShopFilterMixin, APIView):
         threshold = int(request.GET.get("threshold", 10))
         
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Get products with low stock (below threshold but > 0)
         low_stock_products = Product.objects.filter(
@@ -3264,39 +3263,24 @@ class DueAmountDashboardView(ShopFilterMixin, APIView):
     
     def get(self, request):
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         # Calculate total due from customers
-        customers = Customer.objects.filter(shop=shop)
+        customers = Customer.objects.with_totals().filter(shop=shop, total_due__gt=0)
         
         total_due = Decimal('0.00')
         customers_with_due = []
         
         for customer in customers:
-            # Calculate customer's total due
-            sales = Sale.objects.filter(customer=customer, shop=shop)
-            payments = CustomerPayment.objects.filter(customer=customer, shop=shop)
-            
-            total_sales = sales.aggregate(total=Coalesce(Sum("total"), Decimal("0.00")))["total"]
-            total_paid_from_sales = sales.aggregate(total=Coalesce(Sum("paid_amount"), Decimal("0.00")))["total"]
-            total_paid_from_payments = payments.aggregate(total=Coalesce(Sum("amount"), Decimal("0.00")))["total"]
-            total_paid = total_paid_from_sales + total_paid_from_payments
-            customer_due = total_sales - total_paid
-            
-            if customer_due > Decimal('0.00'):
-                # Get last sale date
-                last_sale = sales.order_by('-date').first()
-                
-                customers_with_due.append({
-                    'id': customer.id,
-                    'name': customer.name,
-                    'phone': customer.phone,
-                    'due_amount': float(customer_due),
-                    'last_sale_date': last_sale.date if last_sale else None,
-                    'total_purchases': float(total_sales) if total_sales else 0,
-                })
-                total_due += customer_due
+            customers_with_due.append({
+                'id': customer.id,
+                'name': customer.name,
+                'phone': customer.phone,
+                'due_amount': float(customer.total_due),
+                'last_sale_date': customer.last_sale_date,
+                'total_purchases': float(customer.total_sales) if customer.total_sales else 0,
+            })
+            total_due += customer.total_due
         
         # Sort customers by highest due
         customers_with_due.sort(key=lambda x: x['due_amount'], reverse=True)
@@ -3327,8 +3311,7 @@ class QuickRestockView(ShopFilterMixin, APIView):
         supplier_id = request.data.get('supplier_id')
         
         # Get current shop
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         try:
             product = Product.objects.get(id=product_id, shop=shop)
@@ -3346,12 +3329,19 @@ class CashTransactionListAPIView(ShopFilterMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     
     def get(self, request):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
         
+        # Unfiltered ledger: served from cache, dropped by app/signals.py
+        ttl = settings.LIST_CACHE_TTL
+        key = list_cache_key("cash", shop.pk)
+        if ttl and not request.GET:
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
         # Get query params
         start_date = request.GET.get('start_date')
         end_date = request.GET.get('end_date')
@@ -3397,18 +3387,19 @@ class CashTransactionListAPIView(ShopFilterMixin, APIView):
         # Period balance
         period_balance = summary['total_credit'] - summary['total_debit']
         
-        # Serialize transactions
-        serializer = CashTransactionSerializer(queryset, many=True)
-        
-        return Response({
-            'transactions': serializer.data,
+        # Serialize transactions (plain dicts from .values(), no model instances)
+        data = {
+            'transactions': cash_transactions_serialize_list(queryset),
             'summary': {
                 'total_credit': float(summary['total_credit']),
                 'total_debit': float(summary['total_debit']),
                 'period_balance': float(period_balance),
                 'current_balance': float(current_balance)
             }
-        })
+        }
+        if ttl and not request.GET:
+            cache.set(key, data, ttl)
+        return Response(data)
 
 
 class CashTransactionCreateAPIView(ShopFilterMixin, APIView):
@@ -3432,8 +3423,7 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     
     def post(self, request):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -3441,6 +3431,7 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         start_date = request.data.get('start_date')
         end_date = request.data.get('end_date')
         
+        rows = []
         synced_count = {
             'sales': 0,
             'expenses': 0,
@@ -3454,24 +3445,24 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         if start_date and end_date:
             sales_filter['date__date__range'] = [start_date, end_date]
         
-        sales = Sale.objects.filter(**sales_filter).exclude(
+        sales = Sale.objects.filter(**sales_filter).select_related('customer').exclude(
             id__in=CashTransaction.objects.filter(shop=shop, source='sale').values_list('sale_id', flat=True)
         )
         
         for sale in sales:
             # Only create transaction for non-due payments
             if sale.payment_method != 'due':
-                CashTransaction.objects.create(
+                rows.append(CashTransaction(
                     shop=shop,
                     date=sale.date.date() if hasattr(sale.date, 'date') else sale.date,
                     transaction_type='credit',
                     source='sale',
                     amount=sale.total,
-                    payment_method=sale.payment_method if sale.payment_method in ['cash', 'bank', 'bkash', 'nagad', 'card'] else 'cash',
+                    payment_method=sale.payment_method if sale.payment_method in CashTransaction.SYNCED_PAYMENT_METHODS else 'cash',
                     sale=sale,
                     description=f"Sale to {sale.customer.name if sale.customer else 'Walk-in Customer'}",
                     created_by=request.user
-                )
+                ))
                 synced_count['sales'] += 1
         
         # Sync Expenses (Debit - money going out)
@@ -3484,17 +3475,17 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         )
         
         for expense in expenses:
-            CashTransaction.objects.create(
+            rows.append(CashTransaction(
                 shop=shop,
                 date=expense.date,
                 transaction_type='debit',
                 source='expense',
                 amount=expense.amount,
-                payment_method=expense.payment_method if expense.payment_method in ['cash', 'bank', 'bkash', 'nagad', 'card'] else 'cash',
+                payment_method=expense.payment_method if expense.payment_method in CashTransaction.SYNCED_PAYMENT_METHODS else 'cash',
                 expense=expense,
                 description=f"{expense.category}: {expense.description}" if expense.description else expense.category,
                 created_by=request.user
-            )
+            ))
             synced_count['expenses'] += 1
         
         # Sync Purchases (Debit - money going out for paid purchases)
@@ -3502,24 +3493,24 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         if start_date and end_date:
             purchases_filter['date__range'] = [start_date, end_date]
         
-        purchases = Purchase.objects.filter(**purchases_filter).exclude(
+        purchases = Purchase.objects.filter(**purchases_filter).select_related('supplier').exclude(
             id__in=CashTransaction.objects.filter(shop=shop, source='purchase').values_list('purchase_id', flat=True)
         )
         
         for purchase in purchases:
             # Only sync the paid amount
             if purchase.paid_amount > 0:
-                CashTransaction.objects.create(
+                rows.append(CashTransaction(
                     shop=shop,
                     date=purchase.date,
                     transaction_type='debit',
                     source='purchase',
                     amount=purchase.paid_amount,
-                    payment_method=purchase.payment_method if purchase.payment_method in ['cash', 'bank', 'bkash', 'nagad', 'card'] else 'cash',
+                    payment_method=purchase.payment_method if purchase.payment_method in CashTransaction.SYNCED_PAYMENT_METHODS else 'cash',
                     purchase=purchase,
                     description=f"Purchase from {purchase.supplier.name} - Invoice: {purchase.invoice_no}",
                     created_by=request.user
-                )
+                ))
                 synced_count['purchases'] += 1
         
         # Sync Supplier Payments (Debit - paying supplier dues)
@@ -3527,23 +3518,23 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         if start_date and end_date:
             supplier_payments_filter['date__range'] = [start_date, end_date]
         
-        supplier_payments = SupplierPayment.objects.filter(**supplier_payments_filter).exclude(
+        supplier_payments = SupplierPayment.objects.filter(**supplier_payments_filter).select_related('supplier').exclude(
             id__in=CashTransaction.objects.filter(shop=shop, source='supplier_payment').values_list('supplier_payment_id', flat=True)
         )
         
         for payment in supplier_payments:
-            CashTransaction.objects.create(
+            rows.append(CashTransaction(
                 shop=shop,
                 date=payment.date,
                 transaction_type='debit',
                 source='supplier_payment',
                 amount=payment.amount,
-                payment_method=payment.payment_method if payment.payment_method in ['cash', 'bank', 'bkash', 'nagad', 'card'] else 'cash',
+                payment_method=payment.payment_method if payment.payment_method in CashTransaction.SYNCED_PAYMENT_METHODS else 'cash',
                 supplier_payment=payment,
                 description=f"Payment to supplier: {payment.supplier.name}",
                 reference_no=payment.memo_no,
                 created_by=request.user
-            )
+            ))
             synced_count['supplier_payments'] += 1
         
         # Sync Customer Payments (Credit - collecting customer dues)
@@ -3551,25 +3542,28 @@ class CashTransactionSyncAPIView(ShopFilterMixin, APIView):
         if start_date and end_date:
             customer_payments_filter['date__range'] = [start_date, end_date]
         
-        customer_payments = CustomerPayment.objects.filter(**customer_payments_filter).exclude(
+        customer_payments = CustomerPayment.objects.filter(**customer_payments_filter).select_related('customer').exclude(
             id__in=CashTransaction.objects.filter(shop=shop, source='customer_payment').values_list('customer_payment_id', flat=True)
         )
         
         for payment in customer_payments:
-            CashTransaction.objects.create(
+            rows.append(CashTransaction(
                 shop=shop,
                 date=payment.date,
                 transaction_type='credit',
                 source='customer_payment',
                 amount=payment.amount,
-                payment_method=payment.payment_method if payment.payment_method in ['cash', 'bank', 'bkash', 'nagad', 'card'] else 'cash',
+                payment_method=payment.payment_method if payment.payment_method in CashTransaction.SYNCED_PAYMENT_METHODS else 'cash',
                 customer_payment=payment,
                 description=f"Due payment from customer: {payment.customer.name}",
                 reference_no=payment.memo_no,
                 created_by=request.user
-            )
+            ))
             synced_count['customer_payments'] += 1
         
+        # One insert for everything, with running balances chained in order
+        CashTransaction.bulk_create_with_balance(rows)
+
         return Response({
             'message': 'Sync completed successfully',
             'synced': synced_count,
@@ -3582,8 +3576,7 @@ class CashTransactionSummaryAPIView(ShopFilterMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     
     def get(self, request):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -3598,10 +3591,10 @@ class CashTransactionSummaryAPIView(ShopFilterMixin, APIView):
             queryset = queryset.filter(date__range=[start_date, end_date])
         
         # Summary by source
-        source_summary = queryset.values('source', 'transaction_type').annotate(
+        source_summary = list(queryset.values('source', 'transaction_type').annotate(
             total=Sum('amount'),
             count=Count('id')
-        ).order_by('source')
+        ).order_by('source'))
         
         # Daily summary
         daily_summary = queryset.values('date').annotate(
@@ -3609,16 +3602,16 @@ class CashTransactionSummaryAPIView(ShopFilterMixin, APIView):
             total_debit=Coalesce(Sum('amount', filter=Q(transaction_type='debit')), Decimal('0.00'))
         ).order_by('date')
         
-        # Overall totals
-        totals = queryset.aggregate(
-            total_credit=Coalesce(Sum('amount', filter=Q(transaction_type='credit')), Decimal('0.00')),
-            total_debit=Coalesce(Sum('amount', filter=Q(transaction_type='debit')), Decimal('0.00'))
-        )
+        # Overall totals, added up from the per-source sums instead of
+        # scanning the period again
+        totals = {'total_credit': Decimal('0.00'), 'total_debit': Decimal('0.00')}
+        for row in source_summary:
+            totals['total_' + row['transaction_type']] += row['total']
         
         current_balance = CashTransaction.get_current_balance(shop)
         
         return Response({
-            'source_summary': list(source_summary),
+            'source_summary': source_summary,
             'daily_summary': list(daily_summary),
             'totals': {
                 'total_credit': float(totals['total_credit']),
@@ -3634,8 +3627,7 @@ class CashTransactionDeleteAPIView(ShopFilterMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     
     def delete(self, request, pk):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         try:
             transaction = CashTransaction.objects.get(pk=pk, shop=shop)
@@ -3658,8 +3650,7 @@ class OpeningBalanceAPIView(ShopFilterMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, RoleBasedAccessPermission]
     
     def get(self, request):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -3685,8 +3676,7 @@ class OpeningBalanceAPIView(ShopFilterMixin, APIView):
         })
     
     def post(self, request):
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
         
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -3709,7 +3699,7 @@ class OpeningBalanceAPIView(ShopFilterMixin, APIView):
             existing.amount = amount
             if date_str:
                 existing.date = date_str
-            existing.save()
+            existing.save(update_fields=["amount", "date", "updated_at"])
             return Response({
                 'message': 'Opening balance updated',
                 'amount': float(existing.amount),
@@ -3754,8 +3744,7 @@ class CashTransactionExportPDF(ShopFilterMixin, APIView):
         from io import BytesIO
         from django.http import HttpResponse
 
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -3859,8 +3848,7 @@ class CashTransactionExportExcel(ShopFilterMixin, APIView):
         from io import BytesIO
         from django.http import HttpResponse
 
-        profile = request.user.profile
-        shop = profile.shop if profile else None
+        shop = get_request_shop(request)
 
         if not shop:
             return Response({"error": "No shop associated"}, status=400)
@@ -122,10 +122,31 @@ JAZZMIN_UI_TWEAKS = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'app.backends.ShopAwareJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Cache: per-process memory by default. Set REDIS_URL to share it between
+# gunicorn workers, which also turns on caching of shop cash balances and
+# of the unfiltered sale / cash transaction lists (they are invalidated on
+# write, so every worker must see the same cache).
+import os
+
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+CASH_BALANCE_CACHE_TTL = 60 * 60 if REDIS_URL else 0
+LIST_CACHE_TTL = 60 * 60 if REDIS_URL else 0
+
 # JWT Settings
 from datetime import timedelta
 